@@ -1 +1,12 @@
-from ecb_datainfo.ecb_datainfo import ecb_data_info
\ No newline at end of file
+# Re-export the error class the client modules actually raise (imported
+# flat by them), a separate ecb_datainfo.errors import would be a second
+# copy of the class that except clauses don't match
+from ecb_datainfo.ecb_datainfo import ECB_DATA_INFO, ECBRequestError
+
+
+def __getattr__(name: str):
+    # Defer the prespecified instance to its first access
+    if name == "ecb_data_info":
+        from ecb_datainfo.ecb_datainfo import ecb_data_info
+        return ecb_data_info
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,97 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List
+import requests
+import config as cfg
+from errors import ECBRequestError
+# from . import config as cfg
+# from .errors import ECBRequestError
+
+# Set the static global variables
+BASE_URL = cfg.BASE_URL
+REQUEST_TIMEOUT = cfg.REQUEST_TIMEOUT
+CONNECT_TIMEOUT = cfg.CONNECT_TIMEOUT
+# Upper bound of requests in flight at the same time, one per pooled
+# connection of the shared session
+MAX_CONCURRENCY = cfg.POOL_MAXSIZE
+# Main purpose of the module:
+# Fetch many SDW endpoints concurrently, so a batch of N requests costs
+# roughly the slowest single request instead of the sum of all of them.
+# The blocking requests calls are run in a thread pool driven by asyncio,
+# the GIL is released while waiting on the network.
+
+
+async def fetch(
+    endpoint: str,
+    session: requests.Session,
+    executor: ThreadPoolExecutor=None
+    ) -> bytes:
+    """Fetch a single endpoint relative to the BASE_URL without blocking
+       the event loop
+
+    Args:
+        endpoint (str): path (and query) relative to the BASE_URL, i.e.
+                        "/service/dataflow/ECB/EXR"
+        session (requests.Session): session shared by all requests of a batch
+        executor (ThreadPoolExecutor, optional): thread pool the blocking
+                                                 request is run in.
+                                                 Defaults to None, the
+                                                 default executor of the
+                                                 running loop.
+
+    Raises:
+        ECBRequestError: Error Message for status codes defined in the
+                         error codes dict
+
+    Returns:
+        bytes: raw response body
+    """
+    loop = asyncio.get_running_loop()
+    response = await loop.run_in_executor(
+        executor,
+        partial(session.get, f"{BASE_URL}{endpoint}", timeout=(CONNECT_TIMEOUT, REQUEST_TIMEOUT)))
+    status_code = response.status_code
+    if status_code in cfg.SUCCESS_CODES:
+        return response.content
+    if status_code in cfg.STATUSES:
+        raise ECBRequestError(status_code=status_code, msg=cfg.STATUSES[status_code].message, url=response.url)
+    response.raise_for_status()
+    return response.content
+
+
+async def fetch_many(
+    endpoints: List[str],
+    session: requests.Session=None
+    ) -> List[bytes]:
+    """Fetch all endpoints concurrently over one shared, pooled session
+
+    Args:
+        endpoints (List[str]): paths (and queries) relative to the BASE_URL
+        session (requests.Session, optional): session whose connection pool
+                                              is reused, i.e. the one of an
+                                              ECB_DATA_INFO instance.
+                                              Defaults to None, cfg.SESSION.
+
+    Returns:
+        List[bytes]: raw response bodies in the order of the endpoints
+
+    Example:
+        >>> import asyncio
+        >>> from async_client import fetch_many
+        >>> asyncio.run(fetch_many([
+                "/service/data/FM/M.U2.EUR.RT.MM.EURIBOR1MD_.HSTA?format=csvdata",
+                "/service/data/FM/M.U2.EUR.RT.MM.EURIBOR3MD_.HSTA?format=csvdata"]))
+    """
+    session = session if session is not None else cfg.SESSION
+    max_workers = max(1, min(MAX_CONCURRENCY, len(endpoints)))
+    # The shared session keeps up to MAX_CONCURRENCY connections alive
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        return await asyncio.gather(
+            *(fetch(endpoint=endpoint, session=session, executor=executor)
+              for endpoint in endpoints))
+    finally:
+        # Don't block the event loop on requests still in flight, i.e.
+        # when one of them failed, they finish in the background
+        executor.shutdown(wait=False)
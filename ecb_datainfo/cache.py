@@ -0,0 +1,647 @@
+import os
+import time
+import pickle
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+import config as cfg
+# from . import config as cfg
+
+# Set the static global variables
+CACHE_DIR = cfg.CACHE_DIR
+CACHE_MAX_BYTES = cfg.CACHE_MAX_BYTES
+CACHE_MAX_ENTRIES = cfg.CACHE_MAX_ENTRIES
+CACHE_EXPIRE = cfg.CACHE_EXPIRE
+CACHEABLE_PATH_PREFIXES = cfg.CACHEABLE_PATH_PREFIXES
+DATA_KEYS_CACHE_DIR = cfg.DATA_KEYS_CACHE_DIR
+DATA_KEYS_CACHE_EXPIRE = cfg.DATA_KEYS_CACHE_EXPIRE
+DATA_FRAME_CACHE_MAX_ENTRIES = cfg.DATA_FRAME_CACHE_MAX_ENTRIES
+DATA_FRAME_CACHE_MAX_BYTES = cfg.DATA_FRAME_CACHE_MAX_BYTES
+# Headers that describe the encoded wire body, the cached body is decoded
+UNCACHED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+# Main purpose of the module:
+# Keep the structural metadata responses (codelists, DSDs, dataflows, ...)
+# in an in-memory LRU layered over an on-disk store, so repeated metadata
+# queries never go over the network again. Parsed series keys listings are
+# kept the same way, together with their HTTP validators.
+
+
+def hash_key(
+    key: str
+    ) -> str:
+    """File name stem of a cache key (url or dataflow) used by all caches
+       of the module. A short blake2b digest is plenty for a cache key and
+       cheaper than sha256.
+
+    Args:
+        key (str): cache key
+
+    Returns:
+        str: hex digest of the key
+    """
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def write_atomically(
+    path: str,
+    write: Callable[[str], None]
+    ):
+    """Write a cache file via a temporary file next to it that is moved
+       into place once complete, so readers (other threads or processes)
+       never load a partially written entry and an interrupted write
+       leaves no corrupt one. The temporary name is unique per process and
+       thread, concurrent writers of the same entry don't interleave.
+
+    Args:
+        path (str): final location of the file
+        write (Callable[[str], None]): writes the content to the path passed
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def pickle_atomically(
+    obj: Any,
+    path: str
+    ):
+    """Pickle an object to a cache file, see write_atomically
+
+    Args:
+        obj (Any): object to store
+        path (str): location of the file
+    """
+    def write(tmp_path: str):
+        with open(tmp_path, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    write_atomically(path=path, write=write)
+
+
+def evict_oldest(
+    cache_dir: str,
+    max_bytes: int
+    ):
+    """Remove the least recently written entries of an on-disk store until
+       it fits into max_bytes. All files of an entry (named by its
+       hash_key) are removed together, files being written (.tmp) and
+       subdirectories (other stores) are left alone.
+
+    Args:
+        cache_dir (str): directory of the on-disk store
+        max_bytes (int): size limit of the store
+
+    Returns:
+        int: size of the store after the eviction
+    """
+    entries = {}
+    with os.scandir(cache_dir) as dir_entries:
+        for dir_entry in dir_entries:
+            if not dir_entry.is_file() or dir_entry.name.endswith(".tmp"):
+                continue
+            stat = dir_entry.stat()
+            stem = dir_entry.name.split(".", 1)[0]
+            size, mtime, paths = entries.get(stem, (0, 0.0, []))
+            entries[stem] = (size + stat.st_size, max(mtime, stat.st_mtime), [*paths, dir_entry.path])
+    total_bytes = sum(size for size, _, _ in entries.values())
+    for size, _, paths in sorted(entries.values(), key=lambda entry: entry[1]):
+        if total_bytes <= max_bytes:
+            break
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                # i.e. already removed by another process
+                pass
+        total_bytes -= size
+    return total_bytes
+
+
+class DiskBudget():
+    """Running size of an on-disk store, so the store is only scanned (and
+       its least recently written entries evicted, see evict_oldest) once
+       the written bytes exceed the size limit instead of on every write.
+       The first write of a session scans the store to learn its size.
+    """
+    def __init__(
+        self,
+        cache_dir: str
+        ):
+        # Set the directory of the on-disk store
+        self.cache_dir = cache_dir
+        # Size of the store, None until it was scanned
+        self.total_bytes = None
+        self._lock = threading.Lock()
+
+
+    def add(
+        self,
+        written_bytes: int,
+        max_bytes: int
+        ):
+        """Account for written files and evict entries beyond max_bytes
+
+        Args:
+            written_bytes (int): size of the files just written
+            max_bytes (int): size limit of the store
+        """
+        with self._lock:
+            if self.total_bytes is not None:
+                self.total_bytes += written_bytes
+                if self.total_bytes <= max_bytes:
+                    return
+        total_bytes = evict_oldest(cache_dir=self.cache_dir, max_bytes=max_bytes)
+        with self._lock:
+            self.total_bytes = total_bytes
+
+
+    def reset(self):
+        """Forget the size of the store, i.e. after it was cleared
+        """
+        with self._lock:
+            self.total_bytes = None
+
+
+class MetadataCache():
+    def __init__(
+        self,
+        cache_dir: str=CACHE_DIR,
+        max_bytes: int=CACHE_MAX_BYTES,
+        max_entries: int=CACHE_MAX_ENTRIES,
+        expire: int=CACHE_EXPIRE,
+        ):
+        # Set the directory of the on-disk store
+        self.cache_dir = cache_dir
+        # Set the size limit of the on-disk store
+        self.max_bytes = max_bytes
+        # Set the number of entries kept in memory
+        self.max_entries = max_entries
+        # Set the seconds an entry is used without revalidation
+        self.expire = expire
+        # In-memory LRU layer in front of the on-disk store, shared by the
+        # threads of batched requests and therefore guarded by a lock
+        self.memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_budget = DiskBudget(cache_dir=cache_dir)
+
+
+    def _path(
+        self,
+        url: str
+        ) -> str:
+        """Location of the on-disk entry for an url
+
+        Args:
+            url (str): requested url
+
+        Returns:
+            str: file path of the entry
+        """
+        return os.path.join(self.cache_dir, f"{hash_key(key=url)}.pickle")
+
+
+    def get(
+        self,
+        url: str
+        ) -> Optional[Dict]:
+        """Look up an url, first in memory then on disk
+
+        Args:
+            url (str): requested url
+
+        Returns:
+            Optional[Dict]: entry with the content, headers (incl. ETag and
+                            Last-Modified) and the time it was stored or
+                            last revalidated, None if not cached
+        """
+        with self._lock:
+            entry = self.memory.get(url)
+        if entry is None:
+            try:
+                with open(self._path(url=url), "rb") as f:
+                    entry = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                return None
+        self._remember(url=url, entry=entry)
+        return entry
+
+
+    def is_fresh(
+        self,
+        entry: Dict
+        ) -> bool:
+        """Whether an entry can be used without revalidating it
+        """
+        return time.time() - entry["stored"] < self.expire
+
+
+    def set(
+        self,
+        url: str,
+        content: bytes,
+        headers: Dict[str, str]
+        ):
+        """Store a response body with its headers (incl. ETag and
+           Last-Modified) in memory and on disk
+
+        Args:
+            url (str): requested url
+            content (bytes): decoded response body
+            headers (Dict[str, str]): response headers
+        """
+        entry = {
+            "content": content,
+            "headers": {
+                name: value for name, value in headers.items()
+                if name.lower() not in UNCACHED_HEADERS},
+            "stored": time.time(),
+            }
+        self._remember(url=url, entry=entry)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            pickle_atomically(obj=entry, path=self._path(url=url))
+            self._disk_budget.add(written_bytes=os.path.getsize(self._path(url=url)), max_bytes=self.max_bytes)
+        except OSError as e:
+            logging.warning("Could not write cache entry for url: %s - %s", url, e)
+
+
+    def touch(
+        self,
+        url: str
+        ):
+        """Mark an entry as revalidated (i.e. after a 304 response)
+        """
+        with self._lock:
+            entry = self.memory.get(url)
+            if entry is None:
+                return
+            entry["stored"] = time.time()
+        try:
+            pickle_atomically(obj=entry, path=self._path(url=url))
+        except OSError as e:
+            logging.warning("Could not update cache entry for url: %s - %s", url, e)
+
+
+    def clear(self):
+        """Remove all entries from memory and disk
+        """
+        with self._lock:
+            self.memory.clear()
+        if os.path.isdir(self.cache_dir):
+            for file_name in os.listdir(self.cache_dir):
+                if file_name.endswith(".pickle"):
+                    os.remove(os.path.join(self.cache_dir, file_name))
+        self._disk_budget.reset()
+
+
+    def _remember(
+        self,
+        url: str,
+        entry: Dict
+        ):
+        """Insert an entry as most recently used into the in-memory layer
+        """
+        with self._lock:
+            self.memory[url] = entry
+            self.memory.move_to_end(url)
+            while len(self.memory) > self.max_entries:
+                self.memory.popitem(last=False)
+
+
+class CachingAdapter(HTTPAdapter):
+    """Transport adapter answering GET requests for structural metadata
+       from the MetadataCache, only misses and expired entries go over the
+       network. Expired entries are revalidated with their ETag and
+       Last-Modified, an unchanged (304) entry is served again. Requests
+       sent with Cache-Control: no-cache (i.e. the connection probe) always
+       go over the network and are not stored.
+    """
+    def __init__(
+        self,
+        cache: MetadataCache=None,
+        cacheable_path_prefixes: tuple=CACHEABLE_PATH_PREFIXES,
+        **kwargs
+        ):
+        super().__init__(**kwargs)
+        self.cache = cache if cache is not None else MetadataCache()
+        self.cacheable_path_prefixes = cacheable_path_prefixes
+
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        **kwargs
+        ) -> requests.models.Response:
+        """Answer a request from the cache if possible, else send it.
+           Only GET requests below the cacheable path prefixes without
+           Cache-Control: no-cache are cached, all others are passed on
+           unchanged.
+
+        Args:
+            request (requests.PreparedRequest): request to answer
+            **kwargs: transport options passed on to HTTPAdapter.send
+                      (i.e. timeout, verify, proxies, stream)
+
+        Returns:
+            requests.models.Response: cached or network response, a 304 to
+                                      a revalidation is answered with the
+                                      cached body as 200
+        """
+        if (request.method != "GET"
+                or "no-cache" in request.headers.get("Cache-Control", "")
+                or not urlsplit(request.url).path.startswith(self.cacheable_path_prefixes)):
+            return super().send(request, **kwargs)
+        entry = self.cache.get(url=request.url)
+        if entry is None:
+            response = super().send(request, **kwargs)
+        elif self.cache.is_fresh(entry=entry):
+            return self._build_response_from_entry(request=request, entry=entry)
+        else:
+            response = super().send(self._conditional_request(request=request, entry=entry), **kwargs)
+            if response.status_code == 304:
+                response.close()
+                self.cache.touch(url=request.url)
+                return self._build_response_from_entry(request=request, entry=entry)
+        if response.status_code == 200:
+            self.cache.set(url=request.url, content=response.content, headers=response.headers)
+        return response
+
+
+    def _conditional_request(
+        self,
+        request: requests.PreparedRequest,
+        entry: Dict
+        ) -> requests.PreparedRequest:
+        """Copy of a request revalidating a cached entry with its validators
+        """
+        headers = CaseInsensitiveDict(entry["headers"])
+        conditional_request = request.copy()
+        if headers.get("ETag"):
+            conditional_request.headers["If-None-Match"] = headers["ETag"]
+        if headers.get("Last-Modified"):
+            conditional_request.headers["If-Modified-Since"] = headers["Last-Modified"]
+        return conditional_request
+
+
+    def _build_response_from_entry(
+        self,
+        request: requests.PreparedRequest,
+        entry: Dict
+        ) -> requests.models.Response:
+        """Rebuild a requests response from a cached entry
+        """
+        response = requests.models.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = entry["content"]
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+
+class DataFrameCache():
+    def __init__(
+        self,
+        cache_dir: Optional[str]=DATA_KEYS_CACHE_DIR,
+        expire: int=DATA_KEYS_CACHE_EXPIRE,
+        max_entries: int=DATA_FRAME_CACHE_MAX_ENTRIES,
+        max_bytes: int=DATA_FRAME_CACHE_MAX_BYTES,
+        ):
+        # Set the directory of the on-disk store, None keeps the entries
+        # in memory only
+        self.cache_dir = cache_dir
+        # Set the size limit of the on-disk store
+        self.max_bytes = max_bytes
+        # Set the seconds an entry is used without revalidation
+        self.expire = expire
+        # Set the number of entries kept in memory
+        self.max_entries = max_entries
+        # In-memory LRU layer in front of the on-disk store, shared by the
+        # threads of batched requests and therefore guarded by a lock.
+        # Entries hold the validators, their DataFrame only once it was used.
+        self.memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_budget = DiskBudget(cache_dir=cache_dir)
+
+
+    def _path(
+        self,
+        key: str,
+        suffix: str
+        ) -> str:
+        """Location of an on-disk file of the entry for a key
+        """
+        return os.path.join(self.cache_dir, f"{hash_key(key=key)}.{suffix}")
+
+
+    def get_meta(
+        self,
+        key: str
+        ) -> Optional[Dict]:
+        """Look up the validators of a key, first in memory then in the meta
+           file on disk. A DataFrame stored as parquet is not loaded, so a
+           revalidation costs no parquet read.
+
+        Args:
+            key (str): cache key, i.e. the dataflow or the request url
+
+        Returns:
+            Optional[Dict]: entry with the validators (ETag, Last-Modified)
+                            and the time it was stored or last revalidated,
+                            the DataFrame only if already loaded, None if
+                            not cached
+        """
+        with self._lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                self.memory.move_to_end(key)
+                return entry
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._path(key=key, suffix="pickle"), "rb") as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, ImportError):
+            return None
+        self._remember(key=key, entry=entry)
+        return entry
+
+
+    def get(
+        self,
+        key: str
+        ) -> Optional[Dict]:
+        """Look up a key with its DataFrame, first in memory then on disk
+
+        Args:
+            key (str): cache key, i.e. the dataflow or the request url
+
+        Returns:
+            Optional[Dict]: entry with the DataFrame, its validators (ETag,
+                            Last-Modified) and the time it was stored or
+                            last revalidated, None if not cached
+        """
+        entry = self.get_meta(key=key)
+        if entry is None or "df" in entry:
+            return entry
+        try:
+            if entry.get("parquet", False):
+                # Arrow-backed frames are read back as such, the others
+                # get their dtypes restored from the pandas metadata
+                read_options = {"dtype_backend": "pyarrow"} if entry.get("arrow_backed", False) else {}
+                df = pd.read_parquet(self._path(key=key, suffix="parquet"), **read_options)
+            else:
+                with open(self._path(key=key, suffix="pickle"), "rb") as f:
+                    df = pickle.load(f)["df"]
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError, ValueError, ImportError):
+            # i.e. evicted by another process since the validators were read
+            return None
+        with self._lock:
+            entry["df"] = df
+        return entry
+
+
+    @property
+    def enabled(self) -> bool:
+        """Whether entries are kept at all, in memory or on disk
+        """
+        return self.cache_dir is not None or self.max_entries > 0
+
+
+    def is_fresh(
+        self,
+        entry: Dict
+        ) -> bool:
+        """Whether an entry can be used without revalidating it
+        """
+        return time.time() - entry["stored"] < self.expire
+
+
+    def set(
+        self,
+        key: str,
+        df: pd.DataFrame,
+        etag: Optional[str],
+        last_modified: Optional[str]
+        ):
+        """Store a DataFrame with its validators. The DataFrame is written
+           as zstd compressed parquet if pyarrow is available, else pickled
+           with the validators, and only loaded again once it is used.
+           Without an on-disk store (or if writing fails) a copy is kept in
+           memory instead. The oldest entries are removed once the store
+           exceeds max_bytes.
+
+        Args:
+            key (str): cache key, i.e. the dataflow or the request url
+            df (pd.DataFrame): DataFrame to store, the caller keeps using it
+            etag (Optional[str]): ETag header of the response
+            last_modified (Optional[str]): Last-Modified header of the response
+        """
+        entry = {"etag": etag, "last_modified": last_modified, "stored": time.time(),
+                 "parquet": False, "arrow_backed": False}
+        if self.cache_dir is not None:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                written_bytes = 0
+                if HAS_PYARROW:
+                    write_atomically(
+                        path=self._path(key=key, suffix="parquet"),
+                        write=partial(df.to_parquet, compression="zstd"))
+                    written_bytes += os.path.getsize(self._path(key=key, suffix="parquet"))
+                    entry["parquet"] = True
+                    entry["arrow_backed"] = any(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+                    self._write_meta(key=key, meta=entry)
+                else:
+                    self._write_meta(key=key, meta={**entry, "df": df})
+                written_bytes += os.path.getsize(self._path(key=key, suffix="pickle"))
+                self._remember(key=key, entry=entry)
+                self._disk_budget.add(written_bytes=written_bytes, max_bytes=self.max_bytes)
+                return
+            except (OSError, ValueError, TypeError, ImportError) as e:
+                # i.e. object columns of mixed types can't be stored as parquet
+                logging.warning("Could not write cache entry for key: %s - %s", key, e)
+                entry["parquet"] = False
+        # Kept apart from the DataFrame the caller keeps using
+        entry["df"] = df.copy()
+        self._remember(key=key, entry=entry)
+
+
+    def touch(
+        self,
+        key: str
+        ):
+        """Mark an entry as revalidated (i.e. after a 304 response)
+        """
+        entry = self.get_meta(key=key)
+        if entry is not None and not entry.get("parquet", False):
+            # The pickled DataFrame is rewritten together with the meta
+            entry = self.get(key=key)
+        if entry is None:
+            return
+        with self._lock:
+            entry["stored"] = time.time()
+        if self.cache_dir is None:
+            return
+        try:
+            if entry.get("parquet", False):
+                meta = {name: value for name, value in entry.items() if name != "df"}
+            else:
+                meta = entry
+            self._write_meta(key=key, meta=meta)
+        except OSError as e:
+            logging.warning("Could not update cache entry for key: %s - %s", key, e)
+
+
+    def clear(self):
+        """Remove all entries from memory and disk
+        """
+        with self._lock:
+            self.memory.clear()
+        if self.cache_dir is not None and os.path.isdir(self.cache_dir):
+            for file_name in os.listdir(self.cache_dir):
+                os.remove(os.path.join(self.cache_dir, file_name))
+            self._disk_budget.reset()
+
+
+    def _remember(
+        self,
+        key: str,
+        entry: Dict
+        ):
+        """Insert an entry as most recently used into the in-memory layer
+        """
+        with self._lock:
+            self.memory[key] = entry
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.max_entries:
+                self.memory.popitem(last=False)
+
+
+    def _write_meta(
+        self,
+        key: str,
+        meta: Dict
+        ):
+        """Atomically write the validators (and pickled DataFrame) of an entry
+        """
+        pickle_atomically(obj=meta, path=self._path(key=key, suffix="pickle"))
@@ -1,71 +1,207 @@
-BASE_URL = "https://sdw-wsrest.ecb.europa.eu"
-
-REQUEST_TIMEOUT = 90
-ERROR_CODES_DICT = {
-        400: {
-            "message": "Bad request",
-            "return_": None
-        },
-        401: {
-            "message": "Failed to authenticate, check your authenticat…",
-            "return_": None
-        },
-        410: {
-            "message": "Unauthorized",
-            "return_": None
-        },
-        403: {
-            "message": "Forbidden",
-            "return_": None
-        },
-        404: {
-            "message": "Not Found",
-            "return_": None
-        },
-        405: {
-            "message": "Method not allowed",
-            "return_": None
-        },
-        406: {
-            "message": "Not acceptable",
-            "return_": None
-        },
-        409: {
-            "message": "Conflict",
-            "return_": None
-        },
-        415: {
-            "message": "Unsopprted Media Type",
-            "return_": None
-        },
-        500: {
-            "message": "Internal Server Error",
-            "return_": None
-        },
-        502: {
-            "message": "Bad Gateway",
-            "return_": None
-        },
-        503: {
-            "message": "Service Unavailable",
-            "return_": None
-        },
-        504: {
-            "message": "Gateway Timeout",
-            "return_": None
-        }
+import os
+import sys
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+# All requests go to the current ECB Data Portal API (the legacy SDW host
+# sdw-wsrest.ecb.europa.eu is being retired), the same host the sdmx client
+# uses for the structural metadata.
+# The endpoint and timeouts can be overridden from the environment, i.e. to
+# point the client at a local caching reverse proxy that deduplicates SDW
+# traffic of all processes on a host. A minimal nginx setup:
+#   proxy_cache_path /var/cache/nginx/ecb keys_zone=ecb:10m max_size=1g inactive=1d;
+#   server {
+#       listen 8080;
+#       location / {
+#           proxy_pass https://data-api.ecb.europa.eu;
+#           proxy_ssl_server_name on;
+#           proxy_cache ecb;
+#           proxy_cache_valid 200 1h;
+#           proxy_cache_use_stale error timeout updating;
+#       }
+#   }
+# and then: export ECB_SDW_BASE_URL=http://localhost:8080
+BASE_URL = os.environ.get("ECB_SDW_BASE_URL", "https://data-api.ecb.europa.eu").rstrip("/")
+
+REQUEST_TIMEOUT = float(os.environ.get("ECB_SDW_TIMEOUT", 90))
+# Separate connect timeout, so a slow DNS lookup or unreachable host does
+# not use up the whole read timeout
+CONNECT_TIMEOUT = float(os.environ.get("ECB_SDW_CONNECT_TIMEOUT", 5))
+# Cache for the structural metadata artefacts (codelists, DSDs, ...),
+# these are effectively immutable, so they are kept on disk across sessions
+# and revalidated (conditional GET) once older than CACHE_EXPIRE seconds
+CACHE_DIR = os.path.expanduser("~/.cache/ecb_datainfo")
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+CACHE_MAX_ENTRIES = 1024
+CACHE_EXPIRE = 24 * 60 * 60
+# Parsed series keys listings per dataflow change slowly, they are reused
+# from disk for this many seconds and revalidated afterwards
+DATA_KEYS_CACHE_DIR = os.path.join(CACHE_DIR, "data_keys")
+DATA_KEYS_CACHE_EXPIRE = 24 * 60 * 60
+# Parsed time series are revalidated on every request (conditional GET),
+# only unchanged series (304) are served from disk
+DATA_CACHE_DIR = os.path.join(CACHE_DIR, "data")
+DATA_CACHE_EXPIRE = 0
+# Number of parsed DataFrames per cache kept in memory and size limit of
+# each on-disk DataFrame store, the least recently written entries are
+# removed beyond it
+DATA_FRAME_CACHE_MAX_ENTRIES = 128
+DATA_FRAME_CACHE_MAX_BYTES = 256 * 1024 * 1024
+CACHEABLE_PATH_PREFIXES = (
+    "/service/codelist",
+    "/service/datastructure",
+    "/service/conceptscheme",
+    "/service/dataflow",
+    "/service/categoryscheme",
+    "/service/contentconstraint",
+    )
+# Default content negotiation: compressed transfer with every encoding the
+# installed urllib3 can decode (gzip, deflate, plus br/zstd if brotli or
+# zstandard are installed). Data is requested as SDMX-CSV, the most compact
+# format the client parses; structures stay SDMX-ML since the sdmx1 readers
+# only support SDMX-JSON for data messages.
+DEFAULT_HEADERS = {
+    "Accept-Encoding": ACCEPT_ENCODING,
     }
-SUCCESS_CODES_DICT = {
-    200: {
-        "message": "OK",
-        "return_": "Success"
-        },
-    201: {
-    "message": "Created",
-    "return_": "Success"
-    },
-    204: {
-        "message": "No content",
-        "return_": "Success"
+DATA_HEADERS = {
+    "Accept": "text/csv",
+    }
+# HTTP status codes with their message and whether they count as success
+_RAW_STATUSES = {
+    200: ("OK", True),
+    201: ("Created", True),
+    204: ("No content", True),
+    400: ("Bad request", False),
+    401: ("Failed to authenticate, check your authentication credentials", False),
+    410: ("Gone", False),
+    403: ("Forbidden", False),
+    404: ("Not Found", False),
+    405: ("Method not allowed", False),
+    406: ("Not acceptable", False),
+    409: ("Conflict", False),
+    415: ("Unsupported Media Type", False),
+    500: ("Internal Server Error", False),
+    502: ("Bad Gateway", False),
+    503: ("Service Unavailable", False),
+    504: ("Gateway Timeout", False),
+    }
+
+
+@dataclass(frozen=True)
+class Status():
+    __slots__ = ("message", "ok")
+    message: str
+    ok: bool
+
+
+STATUSES = MappingProxyType({
+    code: Status(message=sys.intern(message), ok=ok)
+    for code, (message, ok) in _RAW_STATUSES.items()
+    })
+# Backwards compatible read-only views in the former dict-of-dicts layout
+ERROR_CODES_DICT = MappingProxyType({
+    code: {"message": status.message, "return_": None}
+    for code, status in STATUSES.items() if not status.ok
+    })
+SUCCESS_CODES_DICT = MappingProxyType({
+    code: {"message": status.message, "return_": "Success"}
+    for code, status in STATUSES.items() if status.ok
+    })
+# Status code classes for membership tests in hot response loops, derived
+# from the dicts above to keep a single source of truth
+SUCCESS_CODES = frozenset(SUCCESS_CODES_DICT)
+RETRIABLE_CODES = frozenset(code for code in ERROR_CODES_DICT if code >= 500)
+CLIENT_ERROR_CODES = frozenset(code for code in ERROR_CODES_DICT if 400 <= code < 500)
+
+
+# Flat status lookup tables, built once at import time from the dicts above.
+# The response classifier indexes these by status code instead of probing
+# the nested dicts on every response.
+STATUS_TABLE_SIZE = 600
+
+
+def build_status_tables(
+    error_codes_dict: Mapping[int, Dict[str, str]],
+    success_codes_dict: Mapping[int, Dict[str, str]]
+    ) -> Tuple[Tuple[Optional[str], ...], bytes]:
+    """Flatten the error and success codes dicts into two tables indexed
+       by the HTTP status code
+
+    Args:
+        error_codes_dict (Mapping[int, Dict[str, str]]): error codes with message
+        success_codes_dict (Mapping[int, Dict[str, str]]): success codes with message
+
+    Returns:
+        Tuple[Tuple[Optional[str], ...], bytes]: message table (None for
+                                                 undefined codes) and
+                                                 success flag table
+    """
+    status_msg = {
+        code: entry.get("message")
+        for dict_ in (error_codes_dict, success_codes_dict)
+        for code, entry in dict_.items()
         }
-}
+    msg_table = tuple(status_msg.get(code) for code in range(STATUS_TABLE_SIZE))
+    ok_table = bytes(
+        1 if code in success_codes_dict else 0
+        for code in range(STATUS_TABLE_SIZE))
+    return msg_table, ok_table
+
+
+_MSG_TABLE, _OK_TABLE = build_status_tables(ERROR_CODES_DICT, SUCCESS_CODES_DICT)
+
+
+def classify(
+    code: int,
+    msg_table: Tuple[Optional[str], ...]=_MSG_TABLE,
+    ok_table: bytes=_OK_TABLE
+    ) -> Tuple[int, Optional[str]]:
+    """Classify a HTTP status code with a single index load per table
+
+    Args:
+        code (int): HTTP status code
+        msg_table (Tuple[Optional[str], ...], optional): message table.
+                                                         Defaults to _MSG_TABLE.
+        ok_table (bytes, optional): success flag table. Defaults to _OK_TABLE.
+
+    Returns:
+        Tuple[int, Optional[str]]: success flag (1 or 0) and the defined
+                                   message, None if the code is not defined
+    """
+    if 0 <= code < STATUS_TABLE_SIZE:
+        return ok_table[code], msg_table[code]
+    return 0, None
+
+
+# Shared HTTP session: keeps connections alive and pooled, so only the first
+# request to the SDW pays the TCP and TLS handshake. Transient server errors
+# (RETRIABLE_CODES) are retried with backoff.
+# Connections kept alive per host, parallel requests are bounded by it so
+# each of them reuses a pooled connection instead of opening (and then
+# discarding) an additional one
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 32
+REQUEST_RETRIES = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=RETRIABLE_CODES,
+    allowed_methods=frozenset(["GET", "HEAD"]),
+    # Return the last response once the retries are used up, so the
+    # status code handling (ECBRequestError) sees the server error
+    raise_on_status=False,
+    )
+_adapter = HTTPAdapter(
+    pool_connections=POOL_CONNECTIONS,
+    pool_maxsize=POOL_MAXSIZE,
+    max_retries=REQUEST_RETRIES,
+    )
+SESSION = requests.Session()
+SESSION.mount("https://", _adapter)
+# Also pool plain http, i.e. when BASE_URL points at a local caching proxy
+SESSION.mount("http://", _adapter)
+SESSION.headers.update(DEFAULT_HEADERS)
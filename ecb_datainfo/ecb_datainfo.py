@@ -1,18 +1,114 @@
-import io
-from typing import List, Dict
+import csv
+import sys
+import asyncio
+import weakref
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, partial
+from types import MappingProxyType
+from urllib.parse import urlencode
+from typing import Callable, List, Dict, Union
 import pandas as pd
 import requests
 import sdmx
 import logging
 logging.basicConfig(level=logging.INFO)
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
 import config as cfg
+import cache
+from errors import ECBRequestError
 # from . import config as cfg
+# from . import cache
+# from .errors import ECBRequestError
 
 # Set the static global variables
 API_ENDPOINT = cfg.BASE_URL
 REQUEST_TIMEOUT = cfg.REQUEST_TIMEOUT
+CONNECT_TIMEOUT = cfg.CONNECT_TIMEOUT
 ERROR_CODES_DICT = cfg.ERROR_CODES_DICT
 SUCCESS_CODES_DICT = cfg.SUCCESS_CODES_DICT
+# Potential occuring errors of the ECB API, defined and interned once for
+# all responses, read-only so the table stays a stable global
+# (Error) Status Code are defined here: https://data.ecb.europa.eu/help/api/status-codes
+_ECB_ERROR_MSGS = MappingProxyType({code: sys.intern(msg) for code, msg in {
+    304: "No changes. There have been no changes to the data since the timestamp supplied in the If-Modified-Since header.",
+    400: "Syntax error. Syntactic or semantic issue with the parameters supplied.",
+    404: "No results found. There are no results matching the query.",
+    406: "Not Acceptable.",
+    500: "Internal Server Error. Feel free to try again later or to contact the support hotline https://ecb-registration.escb.eu/statistical-information.",
+    501: "Not implemented.",
+    503: "Service unavailable: Web service is temporarily unavailable.",
+    }.items()})
+# Parse CSV responses with the multi-threaded Arrow reader if available
+CSV_ENGINE = "pyarrow" if HAS_PYARROW else "c"
+# The SDW always sends UTF-8, the raw bytes are handed to the reader with
+# the encoding declared instead of being decoded into a str first
+CSV_ENCODING = "utf-8"
+# Size of the blocks the Arrow reader tokenizes in parallel, one per thread
+CSV_BLOCK_SIZE = 1 << 20
+# Columns of the SDMX-CSV data responses that repeat (nearly) the same value
+# in every row: the series key, the dimensions shared by all dataflows and
+# the standard ECB series and observation attributes. They are parsed
+# straight into categoricals instead of object columns of repeated strings.
+_ECB_CATEGORY_COLS = (
+    "KEY",
+    "FREQ",
+    "REF_AREA",
+    "CURRENCY",
+    "OBS_STATUS",
+    "OBS_CONF",
+    "TIME_FORMAT",
+    "COLLECTION",
+    "SOURCE_AGENCY",
+    "TITLE",
+    "TITLE_COMPL",
+    "UNIT",
+    )
+# Known schema of the SDMX-CSV data responses, declared upfront instead of
+# inferring the types of every column
+_ECB_CSV_DTYPE = {
+    **{col: "category" for col in _ECB_CATEGORY_COLS},
+    "OBS_VALUE": "float64",
+    }
+_ECB_CSV_DATE_COLS = ["TIME_PERIOD"]
+# Format of the TIME_PERIOD per frequency (second component of the series
+# key), so the dates are parsed without guessing. Other frequencies (i.e.
+# quarterly "2020-Q1") are left to the pandas period parsing.
+_ECB_DATE_FORMATS = {
+    "A": "%Y",
+    "M": "%Y-%m",
+    "D": "%Y-%m-%d",
+    "B": "%Y-%m-%d",
+    }
+# Number of dataflows whose metadata is kept per instance
+_DATAFLOW_METADATA_MAX_ENTRIES = 128
+# Single dataflow requested to test the connection, far cheaper than the
+# full list of dataflows (which is only loaded on access of all_dataflows)
+_CONNECTION_PROBE_DATAFLOW = "EXR"
+# Detail levels of data requests that return no observations (TIME_PERIOD)
+_NO_OBSERVATION_DETAILS = ("serieskeysonly", "nodata")
+# Heavily repeated columns of the series keys listing are stored as
+# categoricals, which shrinks the returned DataFrame considerably
+DATA_KEYS_DTYPES = {
+    "KEY": "category",
+    "FREQ": "category",
+    "UNIT": "category",
+    "UNIT_MULT": "category",
+    "TITLE_COMPL": "string",
+    }
+# With pyarrow the listing is returned as Arrow backed columns instead, else
+# the C reader with the categoricals above is used
+if HAS_PYARROW:
+    DATA_KEYS_READ_OPTIONS = {"arrow_backed": True}
+else:
+    DATA_KEYS_READ_OPTIONS = {"dtype": DATA_KEYS_DTYPES}
+
+
 # Main purposes of the class:
 # Primary purpose: 1) Download Data for a provided series key
 # Secondary purpose: 2) Get information and search for certain properties
@@ -27,9 +123,11 @@ class ECB_DATA_INFO():
         proxies: Dict[str, str]=None,
         verify: bool=None,
         api_endpoint: str=API_ENDPOINT,
-        request_timeout: int=REQUEST_TIMEOUT,
+        request_timeout: float=REQUEST_TIMEOUT,
+        connect_timeout: float=CONNECT_TIMEOUT,
         error_codes_dict: Dict[int, Dict[str, str]]=ERROR_CODES_DICT,
         success_codes_dict: Dict[int, Dict[str, str]]=SUCCESS_CODES_DICT,
+        use_data_cache: bool=True,
         ):
         # Set proxies
         self.proxies = proxies
@@ -37,11 +135,44 @@ class ECB_DATA_INFO():
         self.verify = verify
         # Set the API endpoint
         self.api_endpoint = api_endpoint
+        # Common prefix of all data requests and the template of series
+        # requests, built once
+        self._data_prefix = f"{api_endpoint}/service/data/"
+        self._data_template = self._data_prefix + "{}/{}?format=csvdata"
         # Set the default request timeout
         self.request_timeout = request_timeout
+        # Set the default connect timeout
+        self.connect_timeout = connect_timeout
         # Set the error and success codes dictionaries for requests
         self.error_codes_dict = error_codes_dict
         self.success_codes_dict = success_codes_dict
+        # Flatten them once into index tables for the response classifier
+        self.status_msg_table, self.status_ok_table = cfg.build_status_tables(
+            error_codes_dict=error_codes_dict,
+            success_codes_dict=success_codes_dict)
+        # Parsed series keys per dataflow (reused by all_data_keys_for_dataflow)
+        # and parsed time series per request url (only served after the
+        # server confirmed them as unchanged, 304) are kept with their
+        # validators (ETag, Last-Modified) in size bounded on-disk stores.
+        # Without use_data_cache nothing is kept and every request is sent
+        # unconditionally.
+        if use_data_cache:
+            self.data_keys_cache = cache.DataFrameCache()
+            self.data_cache = cache.DataFrameCache(
+                cache_dir=cfg.DATA_CACHE_DIR,
+                expire=cfg.DATA_CACHE_EXPIRE)
+        else:
+            self.data_keys_cache = cache.DataFrameCache(cache_dir=None, max_entries=0)
+            self.data_cache = cache.DataFrameCache(cache_dir=None, max_entries=0)
+        # Cache the metadata per dataflow, repeated lookups of the same
+        # dataflow don't go over the network again. A plain dict keyed by
+        # the dataflow, a lru_cache around the bound method would tie the
+        # instance (and its session) into a reference cycle.
+        self._dataflow_metadata: Dict[str, sdmx.message.StructureMessage] = {}
+        self._dataflow_metadata_lock = threading.Lock()
+        # Lowercased TITLE_COMPL column per searched DataFrame, dropped
+        # together with the DataFrame
+        self._title_compl_lower_cache: Dict[int, tuple] = {}
         # establish connection - handling/testing is integrated
         self.__ecb_connect(proxies=proxies, verify=verify)
 
@@ -50,47 +181,56 @@ class ECB_DATA_INFO():
     # Testing the connection
     def __connection_handler(
         self,
-        response: requests.models.Response
-        ):
+        response: requests.models.Response,
+        not_modified_ok: bool=False
+        ) -> bool:
         """Testing the response and checking for robustness of returned
            content. Supporting method is used for both the
            sdmx.Client/Response as well as for the generic requests.get
 
         Args:
             response (requests.models.Response): direct requests response
+            not_modified_ok (bool, optional): Accept a 304 response to a
+                                              conditional request instead
+                                              of raising. Defaults to False.
+
+        Returns:
+            bool: False if the content was not modified (304), else True
 
         Raises:
-            Exception: Error Message
-                       (Error) Status Code are defined here:
-                       https://data.ecb.europa.eu/help/api/status-codes
+            ECBRequestError: Error Message
+                             (Error) Status Code are defined here:
+                             https://data.ecb.europa.eu/help/api/status-codes
         """
         # Test the established connection for robustness and validity
-        if "dataflow" in dir(response):
-            connector_response = response.dataflow().response
+        if hasattr(response, "dataflow"):
+            # The probe passes the metadata cache (no-cache), so it always
+            # goes over the network, only the status is read, not the body
+            connector_response = response.session.get(
+                f"{response.source.url}/dataflow/{response.source.id}/{_CONNECTION_PROBE_DATAFLOW}/latest",
+                headers={"Cache-Control": "no-cache"},
+                stream=True,
+                timeout=(self.connect_timeout, self.request_timeout))
+            connector_response.close()
         else:
             connector_response = response
         status_code = connector_response.status_code
         response_url = connector_response.url
         response_headers = connector_response.headers
-        # Define the potential occuring errors
-        errors_msgs = {
-            304: "No changes. There have been no changes to the data since the timestamp supplied in the If-Modified-Since header.",
-            400: "Syntax error. Syntactic or semantic issue with the parameters supplied.",
-            404: "No results found. There are no results matching the query.",
-            406: "Not Acceptable.",
-            500: "Internal Server Error. Feel free to try again later or to contact the support hotline https://ecb-registration.escb.eu/statistical-information.",
-            501: "Not implemented.",
-            503: "Service unavailable: Web service is temporarily unavailable.",
-            }
         if status_code == 200:
-            logging.info(f'Connection established with url: {response_url} and headers: {response_headers}')
+            logging.info("Connection established with url: %s and headers: %s", response_url, response_headers)
+        elif status_code == 304 and not_modified_ok:
+            logging.info("No changes since the last request for url: %s", response_url)
+            return False
         else:
-            if status_code in errors_msgs:
-                raise Exception(f'Request Error Code: {status_code} - {errors_msgs.get(status_code, "")}')
+            msg = _ECB_ERROR_MSGS.get(status_code)
+            if msg is not None:
+                raise ECBRequestError(status_code=status_code, msg=msg, url=response_url)
             else:
-                logging.error(f'Unexpected Error: {response_url} - {response_headers}')
-                logging.error(f'Request Error Code: {status_code}')
+                logging.error("Unexpected Error: %s - %s", response_url, response_headers)
+                logging.error("Request Error Code: %s", status_code)
                 connector_response.raise_for_status()
+        return True
 
 
     ### Further robustness checks
@@ -106,31 +246,23 @@ class ECB_DATA_INFO():
             response (requests.models.Response): generous API response
 
         Raises:
-            Exception: _description_
+            ECBRequestError: Error Message for status codes defined in the
+                             error codes dict
 
         """
         status_code = response.status_code
         response_url = response.url
-        status_code_message = [
-            dict_.get(status_code).get("message")
-            for dict_ in [self.error_codes_dict, self.success_codes_dict]
-            if status_code in dict_.keys()]
+        status_ok, status_code_message = cfg.classify(
+            code=status_code,
+            msg_table=self.status_msg_table,
+            ok_table=self.status_ok_table)
         # If status code is not present in the defined dicts
-        if status_code_message == []:
-            logging.info(f"Status code: {status_code} not defined")
-        else: # if status code is definded in the dicts
-            # get the defined message for the status code
-            status_code_message = f"{"".join(status_code_message)} for URL: {response_url}"
-            # get the defined return (type) for the status code
-            status_code_return = [
-                dict_.get(status_code).get("return_")
-                for dict_ in [self.error_codes_dict, self.success_codes_dict]
-                if status_code in dict_.keys()]
-
-            if status_code_return is not None:
-                logging.info(status_code_message)
-            else:
-                raise Exception("Error")
+        if status_code_message is None:
+            logging.info("Status code: %s not defined", status_code)
+        elif status_ok:
+            logging.info("%s for URL: %s", status_code_message, response_url)
+        else:
+            raise ECBRequestError(status_code=status_code, msg=status_code_message, url=response_url)
 
     # Establishing the connection
     def __ecb_connect(
@@ -140,14 +272,6 @@ class ECB_DATA_INFO():
         ):
         """Connect to the ECB sdmx.Client with specified optional
            proxy and validation parameters.
-           
-           Load directly all available dataflows:
-           Dataflows represent groupings of related data from a
-           particular statistical domain (e.g. balance of payments).
-           They provide a reference to the DSD that applies for a
-           particular domain, thereby indicating how the data for that
-           domain will look.
-           Reference: https://data.ecb.europa.eu/help/api/overview
 
         Args:
             proxies (Dict[str, str]): proxy dict like:
@@ -156,15 +280,189 @@ class ECB_DATA_INFO():
             verify (bool): root certificate which can be used to
                            verify the authenticity of the server-side
                            certificate, if False it is used on own risk
+
+        Structural metadata responses are cached in memory and on disk
+        under cfg.CACHE_DIR, see cache.MetadataCache.
         """
+        # One pooled keep-alive session for all requests of the instance,
+        # structural metadata is served from the (on-disk) metadata cache,
+        # only cache misses go over the network
+        self.metadata_cache = cache.MetadataCache()
+        self._session = requests.Session()
+        self._session.headers.update(cfg.DEFAULT_HEADERS)
+        adapter = cache.CachingAdapter(
+            cache=self.metadata_cache,
+            pool_connections=cfg.POOL_CONNECTIONS,
+            pool_maxsize=cfg.POOL_MAXSIZE,
+            max_retries=cfg.REQUEST_RETRIES)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        if proxies is not None:
+            self._session.proxies = proxies
+        if verify is not None:
+            self._session.verify = verify
         # establish connection via sdmx client for the basic setting
-        ecb_connection = sdmx.Client("ECB", proxies=proxies, verify=verify)
-        # Test connection for robustness
+        ecb_connection = sdmx.Client("ECB", session=self._session)
+        # Test connection for robustness with a single dataflow request,
+        # the full list is only loaded on access of all_dataflows
         self.__connection_handler(response=ecb_connection)
         # set connection
         self.ecb_connection = ecb_connection
-        # directly load all available dataflows to be searchable
-        self.all_dataflows = sdmx.to_pandas(self.ecb_connection.dataflow().dataflow)
+
+
+    def close(self):
+        """Close the pooled keep-alive connections of the instance
+           session. The instance can also be used as context manager,
+           which closes the session on exit.
+
+        Example:
+            >>> with ECB_DATA_INFO() as ecb_data_info_instance:
+                    ecb_data_info_instance.get_ecb_data(series_key="FM.M.U2.EUR.RT.MM.EURIBOR1YD_.HSTA")
+        """
+        self._session.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    @cached_property
+    def all_dataflows(self) -> pd.Series:
+        """All available dataflows, loaded on first access:
+           Dataflows represent groupings of related data from a
+           particular statistical domain (e.g. balance of payments).
+           They provide a reference to the DSD that applies for a
+           particular domain, thereby indicating how the data for that
+           domain will look.
+           Reference: https://data.ecb.europa.eu/help/api/overview
+
+           The first access requests and parses the full list of
+           dataflows once, later accesses return the stored result.
+
+        Returns:
+            pd.Series: dataflow names indexed by the dataflow abbreviation
+        """
+        return sdmx.to_pandas(self.ecb_connection.dataflow().dataflow)
+
+
+    @cached_property
+    def _all_dataflows_lower(self) -> pd.Series:
+        """Lowercased all_dataflows, computed once for the case
+           insensitive search_dataflows
+        """
+        return self.all_dataflows.str.lower()
+
+
+    ### Metadata caching class methods
+    def _fetch_dataflow_metadata(
+        self,
+        dataflow: str
+        ) -> sdmx.message.StructureMessage:
+        """Request the metadata related to a dataflow together with all
+           referenced artefacts (DSD, codelists, concept schemes and
+           constraints) in a single round-trip. Cached per instance by
+           _get_dataflow_metadata
+
+        Args:
+            dataflow (str): chosen dataflow
+
+        Returns:
+            sdmx.message.StructureMessage: metadata of the dataflow
+        """
+        return self.ecb_connection.dataflow(dataflow, params={"references": "all"})
+
+
+    def _get_dataflow_metadata(
+        self,
+        dataflow: str
+        ) -> sdmx.message.StructureMessage:
+        """Metadata of a dataflow, requested on the first lookup and reused
+           afterwards. Beyond _DATAFLOW_METADATA_MAX_ENTRIES dataflows the
+           earliest requested one is dropped.
+
+        Args:
+            dataflow (str): chosen dataflow
+
+        Returns:
+            sdmx.message.StructureMessage: metadata of the dataflow
+        """
+        with self._dataflow_metadata_lock:
+            metadata = self._dataflow_metadata.get(dataflow)
+        if metadata is None:
+            # Requested outside of the lock, lookups of other dataflows
+            # don't wait for it
+            metadata = self._fetch_dataflow_metadata(dataflow)
+            with self._dataflow_metadata_lock:
+                metadata = self._dataflow_metadata.setdefault(dataflow, metadata)
+                while len(self._dataflow_metadata) > _DATAFLOW_METADATA_MAX_ENTRIES:
+                    del self._dataflow_metadata[next(iter(self._dataflow_metadata))]
+        return metadata
+
+
+    def _get_dsd(
+        self,
+        dataflow: str
+        ) -> sdmx.model.common.BaseDataStructureDefinition:
+        """Retrieve the Data Structure Definition (DSD) of a dataflow
+           from the cached dataflow metadata. The referenced DSD is part
+           of the message itself, only if the message carries several
+           DSDs the DataflowDefinition is traversed to pick the right one.
+
+        Args:
+            dataflow (str): chosen dataflow
+
+        Raises:
+            ValueError: if no DSD is found for the dataflow
+
+        Returns:
+            sdmx.model.common.BaseDataStructureDefinition: DSD of the dataflow
+        """
+        metadata_dataflow = self._get_dataflow_metadata(dataflow)
+        if len(metadata_dataflow.structure) == 1:
+            return next(iter(metadata_dataflow.structure.values()))
+        metadata_dataflow_flow = metadata_dataflow.dataflow.get(dataflow)
+        if metadata_dataflow_flow is None:
+            raise ValueError(f"No Data Structure Definition found for dataflow: {dataflow}")
+        return metadata_dataflow_flow.structure
+
+
+    def clear_cache(self):
+        """Clear the in-memory dataflow metadata cache, the next lookups
+           of a dataflow request its metadata again. Cached HTTP
+           responses are cleared via self.metadata_cache.clear(), cached
+           series keys via self.data_keys_cache.clear() and cached time
+           series via self.data_cache.clear()
+        """
+        with self._dataflow_metadata_lock:
+            self._dataflow_metadata.clear()
+
+
+    def _conditional_headers(
+        self,
+        cached: Dict
+        ) -> Dict[str, str]:
+        """Request headers for data requests, turned into a conditional
+           GET with the validators of a cached entry. The server answers
+           with an empty 304 if nothing changed since.
+
+        Args:
+            cached (Dict): entry of a cache.DataFrameCache, None if the
+                           request is not cached
+
+        Returns:
+            Dict[str, str]: request headers
+        """
+        headers = dict(cfg.DATA_HEADERS)
+        if cached is not None:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
 
 
     ### Explanatory class methods - retrieve ECB API Metadata
@@ -174,7 +472,7 @@ class ECB_DATA_INFO():
         case: bool=False
         ) -> pd.Series:
         """Search in the title of the dataflows for matches, either case
-           sensitive or not
+           sensitive or not. The key word is matched as plain substring.
 
         Args:
             key_word (str): key word to search for in the dataflows
@@ -192,12 +490,39 @@ class ECB_DATA_INFO():
             SEE    Securities exchange - Trading Statistics
             dtype: object
         """
-        return self.all_dataflows[self.all_dataflows.str.contains(key_word, case=case)]
+        if case:
+            mask = self.all_dataflows.str.contains(key_word, regex=False, na=False)
+        else:
+            mask = self._all_dataflows_lower.str.contains(key_word.lower(), regex=False, na=False)
+        return self.all_dataflows[mask]
 
 
-    def search_dataflow_attributes(
+    def prefetch_dataflow(
         self,
         dataflow: str
+        ):
+        """Load all metadata of a dataflow with one request. Afterwards
+           search_dataflow_attributes, search_dataflow_dimensions,
+           search_dataflow_dimension_values, search_dataflow_measures
+           and search_dataflow_constraints answer from memory without
+           further network calls. Recommended before exploring a dataflow.
+
+        Args:
+            dataflow (str): chosen dataflow
+
+        Example:
+            >>> ecb_data_info_instance = ECB_DATA_INFO()
+            >>> ecb_data_info_instance.prefetch_dataflow(dataflow="EXR")
+            >>> ecb_data_info_instance.search_dataflow_dimensions(dataflow="EXR")
+            ['FREQ', 'CURRENCY', 'CURRENCY_DENOM', 'EXR_TYPE', 'EXR_SUFFIX', 'TIME_PERIOD']
+        """
+        self._get_dataflow_metadata(dataflow)
+
+
+    def search_dataflow_attributes(
+        self,
+        dataflow: str,
+        as_pandas: bool=False
         ) -> List[str]:
         """Attributes do not help in identifying statistical data;
            they are characteristics that add useful qualitative
@@ -211,6 +536,10 @@ class ECB_DATA_INFO():
 
         Args:
             dataflow (str): chosen dataflow
+            as_pandas (bool, optional): Convert the components via
+                                        sdmx.to_pandas instead of only
+                                        collecting their ids.
+                                        Defaults to False.
 
         Returns:
             List[str]: attributes for the dataflow
@@ -223,26 +552,15 @@ class ECB_DATA_INFO():
             'PUBL_PUBLIC', 'DECIMALS', 'SOURCE_AGENCY', 'TITLE', 'TITLE_COMPL',
             'UNIT', 'UNIT_MULT']
         """
-        # Extract the metadata related to a dataflow
-        metadata_dataflow = self.ecb_connection.dataflow(dataflow)
-        # Explicitly retrieve the DataflowDefinition object
-        metadata_dataflow_flow = metadata_dataflow.dataflow.get(dataflow)
-        if metadata_dataflow_flow is None:
-            raise ValueError(f"No DataflowDefinition found for dataflow: {dataflow}")
-
-        # Access the Data Structure Definition (DSD)
-        # data structure definition: DSD
-        # this object contains metadata that describes the structure of data in the dataflow
-        dsd_flow = metadata_dataflow_flow.structure
-
-        # Extract the attributes and return them as a Pandas DataFrame
-        # identifying attributes of a series that belongs to this dataflow
-        return sdmx.to_pandas(dsd_flow.attributes.components)
+        # Attributes of the (cached) Data Structure Definition (DSD)
+        components = self._get_dsd(dataflow=dataflow).attributes.components
+        return sdmx.to_pandas(components) if as_pandas else [c.id for c in components]
 
 
     def search_dataflow_dimensions(
         self,
-        dataflow: str
+        dataflow: str,
+        as_pandas: bool=False
         ) -> List[str]:
         """Dimensions can be used in combination to specifically identify
            statistical data. Dimensions are the measured aspects of a
@@ -253,6 +571,10 @@ class ECB_DATA_INFO():
 
         Args:
             dataflow (str): chosen dataflow
+            as_pandas (bool, optional): Convert the components via
+                                        sdmx.to_pandas instead of only
+                                        collecting their ids.
+                                        Defaults to False.
 
         Returns:
             List[str]: dimensions (columns) for the dataflow
@@ -262,23 +584,10 @@ class ECB_DATA_INFO():
             >>> ecb_data_info_instance.search_dataflow_dimensions(dataflow="EXR")
             ['FREQ', 'CURRENCY', 'CURRENCY_DENOM', 'EXR_TYPE', 'EXR_SUFFIX', 'TIME_PERIOD']
         """
-        # Extract the metadata related to a data flow
-        metadata_dataflow = self.ecb_connection.dataflow(dataflow)
-
-        # Explicitly retrieve the DataflowDefinition object
-        metadata_dataflow_flow = metadata_dataflow.dataflow.get(dataflow)
-        if metadata_dataflow_flow is None:
-            raise ValueError(f"No DataflowDefinition found for dataflow: {dataflow}")
-
-        # Access the Data Structure Definition (DSD)
-        # data structure definition: DSD
-        # this object contains metadata that describes the structure of data in the dataflow
-        dsd_flow = metadata_dataflow_flow.structure
-
-        # Extract the dimensions and return them as a Pandas DataFrame
-        # here we can see all the columns we would get from a request
-        # of a time series belonging to this dataflow
-        return sdmx.to_pandas(dsd_flow.dimensions.components)
+        # Dimensions of the (cached) Data Structure Definition (DSD), these
+        # are the columns we would get from a request of a time series
+        components = self._get_dsd(dataflow=dataflow).dimensions.components
+        return sdmx.to_pandas(components) if as_pandas else [c.id for c in components]
 
 
     def search_dataflow_dimension_values(
@@ -341,23 +650,14 @@ class ECB_DATA_INFO():
                 SP00                                                 Spot
                 Name: Exchange rate type code list, dtype: object
         """
-        # Extract the metadata related to a data flow
-        metadata_dataflow = self.ecb_connection.dataflow(dataflow)
-
-        # Explicitly retrieve the DataflowDefinition object
-        metadata_dataflow_flow = metadata_dataflow.dataflow.get(dataflow)
-        if metadata_dataflow_flow is None:
-            raise ValueError(f"No DataflowDefinition found for dataflow: {dataflow}")
-
-        # Access the Data Structure Definition (DSD)
-        # data structure definition: DSD
+        # Access the (cached) Data Structure Definition (DSD)
         # this object contains metadata that describes the structure of data in the dataflow
-        dsd_flow = metadata_dataflow_flow.structure
+        dsd_flow = self._get_dsd(dataflow=dataflow)
 
         # Extract dimensions and ensure it's a valid DataFrame
         # here we can see all the columns we would get from a request
         # of a time series belonging to this dataflow
-        dimensions_list = sdmx.to_pandas(dsd_flow.dimensions.components)
+        dimensions_list = [c.id for c in dsd_flow.dimensions.components]
         # Check if the dimension exists in the dataflow
         if dimension not in dimensions_list:
             raise ValueError(f"Dimension '{dimension}' not found in dataflow: {dataflow}")
@@ -409,8 +709,8 @@ class ECB_DATA_INFO():
                     5    E
                     Name: EXR_SUFFIX, dtype: object, 'FREQ': 0    A
         """
-        # Extract the metadata related to a data flow
-        metadata_dataflow = self.ecb_connection.dataflow(dataflow)
+        # Extract the (cached) metadata related to a data flow
+        metadata_dataflow = self._get_dataflow_metadata(dataflow)
         # Constraints on valid parameter values for a dataflow
         attribute = f"{dataflow}_CONSTRAINTS"
         return sdmx.to_pandas(metadata_dataflow.constraint.get(attribute, None))
@@ -418,7 +718,8 @@ class ECB_DATA_INFO():
 
     def search_dataflow_measures(
         self,
-        dataflow: str
+        dataflow: str,
+        as_pandas: bool=False
         ) -> List[str]:
         """In SDMX, the measurement of a phenomenon is known as an
             Observation. A grouping of several Observations is called a
@@ -427,6 +728,10 @@ class ECB_DATA_INFO():
 
         Args:
             dataflow (str): Chosen dataflow.
+            as_pandas (bool, optional): Convert the components via
+                                        sdmx.to_pandas instead of only
+                                        collecting their ids.
+                                        Defaults to False.
 
         Returns:
             List[str]: Measures of the time series.
@@ -436,23 +741,15 @@ class ECB_DATA_INFO():
             >>> ecb_data_info_instance.search_dataflow_measures(dataflow="SEE")
                     ['OBS_VALUE']
         """
-        # Extract the metadata related to a data flow
-        metadata_dataflow = self.ecb_connection.dataflow(dataflow)
-
-        # Explicitly retrieve the DataflowDefinition object
-        metadata_dataflow_flow = metadata_dataflow.dataflow.get(dataflow)
-        if metadata_dataflow_flow is None:
-            raise ValueError(f"No DataflowDefinition found for dataflow: {dataflow}")
-
-        # Access the Data Structure Definition (DSD)
-        dsd_flow = metadata_dataflow_flow.structure
-
-        return sdmx.to_pandas(dsd_flow.measures.components)
+        # Measures of the (cached) Data Structure Definition (DSD)
+        components = self._get_dsd(dataflow=dataflow).measures.components
+        return sdmx.to_pandas(components) if as_pandas else [c.id for c in components]
 
 
     def all_data_keys_for_dataflow(
         self,
-        dataflow: str
+        dataflow: str,
+        columns: List[str]=None
         ) -> pd.DataFrame:
         """The single attribute values ecaxtly identify a unique time
            series key that can be loaded. I.e:
@@ -460,9 +757,17 @@ class ECB_DATA_INFO():
            separated values represent the attributes.
            Here, for a given dataflow, all directly retrievable time series
            (keys) are returned with their comprising attribute values.
+           The parsed result is cached on disk (see config.DATA_KEYS_CACHE_DIR)
+           and reused for config.DATA_KEYS_CACHE_EXPIRE seconds, also
+           across sessions. Afterwards the call is sent as conditional
+           request and returns the cached result if the server reports
+           no changes (304).
 
         Args:
             dataflow (str): Chosen dataflow
+            columns (List[str], optional): Subset of dimensions (columns)
+                                           to parse. Defaults to None,
+                                           all columns.
 
         Returns:
             pd.DataFrame: All available time series (keys) to load and
@@ -488,31 +793,90 @@ class ECB_DATA_INFO():
         #          are related to the dataflow
         # Check if provided argument is indeed in the existing list
         if dataflow in self.all_dataflows.index:
-            req_url = f"https://data-api.ecb.europa.eu/service/data/{dataflow}"
-            response = requests.get(req_url,
-                                    headers={'Accept': 'text/csv'},
-                                    timeout=90)
-            # Check for robustness
-            self.__connection_handler(response=response)
-            df = pd.read_csv(io.StringIO(response.text))
-            return df
+            req_url = f"{self._data_prefix}{dataflow}"
+            cache_key = f"{dataflow}:{','.join(columns)}" if columns else dataflow
+            return self._fetch_csv(req_url=req_url,
+                                   data_cache=self.data_keys_cache,
+                                   cache_key=cache_key,
+                                   parse=partial(self._read_csv, columns=columns, **DATA_KEYS_READ_OPTIONS))
         else:
-            logging.error(f"Provided dataflow: {dataflow} is not existing")
+            logging.error("Provided dataflow: %s is not existing", dataflow)
+
+
+    def batch_get_data_keys(
+        self,
+        dataflows: List[str],
+        max_workers: int=8
+        ) -> Dict[str, pd.DataFrame]:
+        """Load all available time series (keys) for several dataflows
+           concurrently, see all_data_keys_for_dataflow. Dataflows with a
+           fresh entry in the data keys cache are answered without a
+           request, the remaining ones share the pooled keep-alive
+           connections of the instance session, the parallelism is
+           capped at config.POOL_MAXSIZE.
+
+        Args:
+            dataflows (List[str]): Chosen dataflows
+            max_workers (int, optional): Number of parallel requests.
+                                         Defaults to 8.
+
+        Returns:
+            Dict[str, pd.DataFrame]: All available time series (keys)
+                                     per dataflow. Duplicate dataflows
+                                     are requested and returned once,
+                                     every DataFrame is a separate
+                                     object, not shared with the cache.
+
+        Example:
+            >>> ecb_data_info_instance = ECB_DATA_INFO()
+            >>> ecb_data_info_instance.batch_get_data_keys(dataflows=["SEE", "EXR"])
+            {'SEE':                         KEY FREQ  ...       UNIT UNIT_MULT
+                0      SEE.A.AT.WBR0.D00.Z.Q    A  ...  PURE_NUMB         1
+                ...
+        """
+        # Load the dataflows once upfront instead of racing in every thread
+        self.all_dataflows
+        # Request every dataflow only once and only if it is not cached,
+        # duplicates collapse into one key of the result
+        unique_dataflows = list(dict.fromkeys(dataflows))
+        data_keys = {}
+        for dataflow in unique_dataflows:
+            cached = self.data_keys_cache.get_meta(key=dataflow)
+            if cached is not None and self.data_keys_cache.is_fresh(entry=cached):
+                cached = self.data_keys_cache.get(key=dataflow)
+                if cached is not None:
+                    data_keys[dataflow] = cached["df"].copy()
+        missing = [dataflow for dataflow in unique_dataflows if dataflow not in data_keys]
+        if missing:
+            # More workers than pooled connections would open connections
+            # that are discarded again after their request
+            max_workers = max(1, min(max_workers, cfg.POOL_MAXSIZE, len(missing)))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                data_keys.update(zip(missing, executor.map(self.all_data_keys_for_dataflow, missing)))
+        return {dataflow: data_keys[dataflow] for dataflow in unique_dataflows}
 
 
     def search_data_keys_for_dataflow(
         self,
         key_word: str,
-        all_data_keys_for_dataflow: pd.DataFrame
+        all_data_keys_for_dataflow: pd.DataFrame,
+        precomputed_lower: pd.Series=None
         ) -> pd.DataFrame:
-        """Search for a keyword in the dimension (column) TITLE_COMPL to
-           filter down the potential series key results.
+        """Search case insensitive for a keyword in the dimension (column)
+           TITLE_COMPL to filter down the potential series key results.
+           The lowercased column is computed on the first search and
+           reused by further searches on the same (unmodified) DataFrame.
 
         Args:
             key_word (str): ke word to look for
             all_data_keys_for_dataflow (pd.DataFrame): all available
                                                        series keys for a
                                                        dataflow
+            precomputed_lower (pd.Series, optional): lowercased TITLE_COMPL
+                                                     column to reuse across
+                                                     repeated searches on
+                                                     the same frame.
+                                                     Defaults to None.
         Returns:
             pd.DataFrame: Filtering results.
 
@@ -535,9 +899,35 @@ class ECB_DATA_INFO():
 
                     [13564 rows x 26 columns]
         """
-        title_compl_lower = [title_c.lower() for title_c in all_data_keys_for_dataflow.TITLE_COMPL.unique().tolist()]
-        key_word_results = [title_c for title_c in title_compl_lower if key_word in title_c]
-        return all_data_keys_for_dataflow.query('TITLE_COMPL.str.lower().isin(@key_word_results)').reset_index(drop=True)
+        if precomputed_lower is None:
+            precomputed_lower = self._title_compl_lower(df=all_data_keys_for_dataflow)
+        mask = precomputed_lower.str.contains(key_word.lower(), regex=False, na=False)
+        return all_data_keys_for_dataflow.loc[mask].reset_index(drop=True)
+
+
+    def _title_compl_lower(
+        self,
+        df: pd.DataFrame
+        ) -> pd.Series:
+        """Lowercased TITLE_COMPL column of a series keys DataFrame,
+           computed once per DataFrame. It is kept on the instance instead
+           of in df.attrs, which pandas deep-copies into every derived
+           DataFrame (i.e. each search result).
+
+        Args:
+            df (pd.DataFrame): series keys of a dataflow
+
+        Returns:
+            pd.Series: lowercased TITLE_COMPL column
+        """
+        key = id(df)
+        cached = self._title_compl_lower_cache.get(key)
+        if cached is not None and cached[0]() is df and len(cached[1]) == len(df):
+            return cached[1]
+        lower = df["TITLE_COMPL"].str.lower()
+        lower_cache = self._title_compl_lower_cache
+        lower_cache[key] = (weakref.ref(df, lambda _: lower_cache.pop(key, None)), lower)
+        return lower
 
 
     def all_category_schemes(
@@ -573,6 +963,96 @@ class ECB_DATA_INFO():
         return sdmx.to_pandas(cat_schemes.category_scheme.MOBILE_NAVI)
 
 
+    ### Async class methods - mirror the blocking lookups for event loops
+    async def _run_async(
+        self,
+        func,
+        **kwargs
+        ):
+        """Run a blocking class method in the default executor of the
+           running loop, the event loop stays responsive meanwhile and
+           several calls can be awaited concurrently via asyncio.gather.
+           The requests share the pooled connections of the instance session.
+
+        Args:
+            func (Callable): blocking class method to run
+            **kwargs: keyword arguments for func
+
+        Returns:
+            Any: result of func
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(func, **kwargs))
+
+
+    async def asearch_dataflow_attributes(
+        self,
+        dataflow: str,
+        as_pandas: bool=False
+        ) -> List[str]:
+        """Async variant of search_dataflow_attributes
+        """
+        return await self._run_async(self.search_dataflow_attributes, dataflow=dataflow, as_pandas=as_pandas)
+
+
+    async def asearch_dataflow_dimensions(
+        self,
+        dataflow: str,
+        as_pandas: bool=False
+        ) -> List[str]:
+        """Async variant of search_dataflow_dimensions
+        """
+        return await self._run_async(self.search_dataflow_dimensions, dataflow=dataflow, as_pandas=as_pandas)
+
+
+    async def asearch_dataflow_dimension_values(
+        self,
+        dataflow: str,
+        dimension: str
+        ) -> pd.Series:
+        """Async variant of search_dataflow_dimension_values
+        """
+        return await self._run_async(self.search_dataflow_dimension_values, dataflow=dataflow, dimension=dimension)
+
+
+    async def asearch_dataflow_constraints(
+        self,
+        dataflow: str
+        ) -> Dict[str, pd.Series]:
+        """Async variant of search_dataflow_constraints
+        """
+        return await self._run_async(self.search_dataflow_constraints, dataflow=dataflow)
+
+
+    async def asearch_dataflow_measures(
+        self,
+        dataflow: str,
+        as_pandas: bool=False
+        ) -> List[str]:
+        """Async variant of search_dataflow_measures
+        """
+        return await self._run_async(self.search_dataflow_measures, dataflow=dataflow, as_pandas=as_pandas)
+
+
+    async def aall_data_keys_for_dataflow(
+        self,
+        dataflow: str,
+        columns: List[str]=None
+        ) -> pd.DataFrame:
+        """Async variant of all_data_keys_for_dataflow
+
+        Example:
+            >>> import asyncio
+            >>> ecb_data_info_instance = ECB_DATA_INFO()
+            >>> async def main():
+                    return await asyncio.gather(
+                        ecb_data_info_instance.aall_data_keys_for_dataflow(dataflow="SEE"),
+                        ecb_data_info_instance.aall_data_keys_for_dataflow(dataflow="EXR"))
+            >>> see_keys, exr_keys = asyncio.run(main())
+        """
+        return await self._run_async(self.all_data_keys_for_dataflow, dataflow=dataflow, columns=columns)
+
+
     ### Data retrieval class methods - load actual time series data
     def _build_url(
         self,
@@ -694,16 +1174,23 @@ class ECB_DATA_INFO():
         Returns:
             str: Complete url for request.
         """
-        data_flow, series_key_rest = series_key.split(".", 1)
-        req_url = f'{self.api_endpoint}/service/data/{data_flow}/{series_key_rest}?format=csvdata'
+        data_flow, _, series_key_rest = series_key.partition(".")
+        req_url = self._data_template.format(data_flow, series_key_rest)
         # if additional paramters are specified add them to the created url
-        if start_date: req_url += f'&startPeriod={start_date}'
-        if end_date: req_url += f'&endPeriod={end_date}'
-        if detail: req_url += f'&detail={detail}'
-        if update_after: req_url += f'&updatedAfter={update_after}'
-        if first_n_observations: req_url += f'&firstNObservations={first_n_observations}'
-        if last_n_observations: req_url += f'&lastNObservations={last_n_observations}'
-        if include_history: req_url += f'&includeHistory={include_history}'
+        params = {
+            name: str(value).lower() if isinstance(value, bool) else value
+            for name, value in (
+                ("startPeriod", start_date),
+                ("endPeriod", end_date),
+                ("detail", detail),
+                ("updatedAfter", update_after),
+                ("firstNObservations", first_n_observations),
+                ("lastNObservations", last_n_observations),
+                ("includeHistory", include_history))
+            if value}
+        if params:
+            # "%" is kept as is, update_after may already be percent-encoded
+            req_url += f"&{urlencode(params, safe='%')}"
         return req_url
 
 
@@ -717,9 +1204,15 @@ class ECB_DATA_INFO():
         first_n_observations: int=None,
         last_n_observations: int=None,
         include_history: bool=None,
-        ascending: bool=True
-        ) -> pd.DataFrame:
+        ascending: bool=True,
+        columns: List[str]=None,
+        squeeze: bool=False
+        ) -> Union[pd.DataFrame, pd.Series]:
         """Fetches the specified time series key with given parameters.
+           Repeated requests are sent as conditional requests, a series
+           the server reports as unchanged (304) is served from the data
+           cache (see config.DATA_CACHE_DIR) without downloading and
+           parsing it again.
 
         Args:
             series_key (str): time series key to fetch
@@ -731,10 +1224,23 @@ class ECB_DATA_INFO():
             last_n_observations (int, optional): see _build_url. Defaults to None.
             include_history (bool, optional): see _build_url. Defaults to None.
             ascending (bool, optional): see _build_url. Defaults to True.
+            columns (List[str], optional): Subset of dimensions (columns)
+                                           to parse, TIME_PERIOD is always
+                                           included. Defaults to None,
+                                           all columns.
+            squeeze (bool, optional): Only parse the observations and return
+                                      them as Series indexed by date.
+                                      Defaults to False.
+
+        Raises:
+            ValueError: if squeeze is requested for a detail level without
+                        observations
 
         Returns:
-            pd.DataFrame: Fetched data for time series key with data
-                          dimensions (columns) for respective dataflow.
+            Union[pd.DataFrame, pd.Series]: Fetched data for time series key
+                                            with data dimensions (columns)
+                                            for respective dataflow, or only
+                                            the OBS_VALUE Series if squeezed.
 
         Example:
             >>> ecb_data_info_instance = ECB_DATA_INFO()
@@ -768,18 +1274,345 @@ class ECB_DATA_INFO():
                                       first_n_observations=first_n_observations,
                                       last_n_observations=last_n_observations,
                                       include_history=include_history)
-            response = requests.get(req_url,
-                                    # headers={'Accept': 'text/csv'},
-                                    timeout=90)
-            # Test the response with response handler
-            self.__connection_handler(response=response)
-            df = pd.read_csv(io.StringIO(response.content.decode()))
-            if "TIME_PERIOD" in df.columns:
-                df = df.rename({"TIME_PERIOD": "Date"},
-                                            axis=1).set_index("Date")
+            # Observations (and thereby TIME_PERIOD) are only part of the
+            # response if not excluded by the detail level
+            with_observations = detail not in _NO_OBSERVATION_DETAILS
+            if squeeze:
+                if not with_observations:
+                    raise ValueError(f"squeeze requires observations, not available for detail: {detail}")
+                # None of the other columns is tokenized or built
+                columns = ["OBS_VALUE"]
+            if columns is not None and with_observations:
+                columns = list(dict.fromkeys([*columns, *_ECB_CSV_DATE_COLS]))
+            cache_key = f"{req_url}|{','.join(columns)}" if columns else req_url
+            df = self._fetch_csv(req_url=req_url,
+                                 data_cache=self.data_cache,
+                                 cache_key=cache_key,
+                                 parse=partial(self._read_ecb_data,
+                                               series_key=series_key,
+                                               detail=detail,
+                                               columns=columns))
+            df = self._sort_by_date(df=df, ascending=ascending)
+            return df["OBS_VALUE"] if squeeze else df
+
+
+    def _fetch_csv(
+        self,
+        req_url: str,
+        data_cache: cache.DataFrameCache,
+        cache_key: str,
+        parse: Callable
+        ) -> pd.DataFrame:
+        """Request a CSV resource through a DataFrameCache, shared by the
+           data and the series keys requests. A fresh cached DataFrame is
+           returned without any request, a known one is revalidated with
+           a conditional GET built from its validators alone and only
+           loaded if the server reports no changes (304). Otherwise the
+           streamed response is parsed and stored.
+
+        Args:
+            req_url (str): requested url
+            data_cache (cache.DataFrameCache): cache of the parsed responses
+            cache_key (str): key of the parsed response in the cache
+            parse (Callable): parses the decoded raw response stream
+                              (passed as raw) into a DataFrame
+
+        Returns:
+            pd.DataFrame: copy of the cached or the newly parsed DataFrame
+        """
+        cached = data_cache.get_meta(key=cache_key)
+        if cached is not None and data_cache.is_fresh(entry=cached):
+            entry = data_cache.get(key=cache_key)
+            if entry is not None:
+                return entry["df"].copy()
+        while True:
+            # Stream the body directly into the parser instead of buffering
+            # the full response first, a known request is reissued as
+            # conditional GET
+            with self._session.get(req_url,
+                                   headers=self._conditional_headers(cached=cached),
+                                   timeout=(self.connect_timeout, self.request_timeout),
+                                   stream=True) as response:
+                # Test the response with response handler
+                if self.__connection_handler(response=response, not_modified_ok=cached is not None):
+                    # The body arrives compressed as negotiated via
+                    # cfg.DEFAULT_HEADERS (gzip, plus br/zstd if installed)
+                    # and is decoded while streaming into the parser
+                    logging.debug("Content-Encoding: %s for url: %s", response.headers.get("Content-Encoding"), req_url)
+                    response.raw.decode_content = True
+                    df = parse(raw=response.raw)
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+                    break
+            # Not modified (304), only now the stored DataFrame is loaded
+            entry = data_cache.get(key=cache_key)
+            if entry is not None:
+                data_cache.touch(key=cache_key)
+                return entry["df"].copy()
+            # The stored DataFrame is gone (i.e. evicted by another process)
+            # since its validators were read, request it unconditionally
+            cached = None
+        # Without validators an entry can only be reused while it is fresh
+        if data_cache.enabled and (data_cache.expire > 0 or etag or last_modified):
+            data_cache.set(key=cache_key, df=df, etag=etag, last_modified=last_modified)
+        return df
+
+
+    def _read_ecb_data(
+        self,
+        raw,
+        series_key: str,
+        detail: str=None,
+        columns: List[str]=None
+        ) -> pd.DataFrame:
+        """Parse a time series data response, the TIME_PERIOD becomes the
+           Date index
+
+        Args:
+            raw (urllib3.response.HTTPResponse): decoded raw response stream
+            series_key (str): requested time series key
+            detail (str, optional): see _build_url. Defaults to None.
+            columns (List[str], optional): Subset of columns to parse.
+                                           Defaults to None, all columns.
+
+        Returns:
+            pd.DataFrame: parsed time series
+        """
+        if detail == "serieskeysonly":
+            # Only the keys and their dimensions, nothing to infer
+            return self._read_series_keys(content=raw.read(), columns=columns)
+        # Observations (and thereby TIME_PERIOD) are only part of the
+        # response if not excluded by the detail level, the dates are
+        # parsed with the known format of the frequency straight into
+        # the index
+        with_observations = detail not in _NO_OBSERVATION_DETAILS
+        frequency = series_key.partition(".")[2].partition(".")[0]
+        df = self._read_csv(raw=raw,
+                            columns=columns,
+                            dtype=_ECB_CSV_DTYPE,
+                            parse_dates=_ECB_CSV_DATE_COLS if with_observations else None,
+                            date_format=_ECB_DATE_FORMATS.get(frequency),
+                            index_col=_ECB_CSV_DATE_COLS[0] if with_observations else None)
+        if df.index.name == "TIME_PERIOD":
+            df.index.name = "Date"
+            # Only periods the reader couldn't parse are left to convert
+            if not pd.api.types.is_datetime64_any_dtype(df.index):
                 df.index = pd.to_datetime(df.index)
-            return df.sort_index(ascending=ascending)
+        return df
+
+
+    def _read_csv(
+        self,
+        raw,
+        columns: List[str]=None,
+        dtype: Dict[str, str]=None,
+        parse_dates: List[str]=None,
+        date_format: str=None,
+        index_col: str=None,
+        arrow_backed: bool=False
+        ) -> pd.DataFrame:
+        """Parse a streamed CSV response, shared by the data and the
+           series keys requests. With pyarrow the body is tokenized block
+           wise on all cores by the Arrow reader and the columns are handed
+           over to pandas while the Arrow buffers are released, else the
+           pandas C reader is used.
+
+        Args:
+            raw (urllib3.response.HTTPResponse): decoded raw response stream
+            columns (List[str], optional): Subset of columns to read, in
+                                           the returned order. Defaults
+                                           to None, all columns.
+            dtype (Dict[str, str], optional): Declared pandas dtypes per
+                                              column. Defaults to None.
+            parse_dates (List[str], optional): Columns to parse as dates.
+                                               Defaults to None.
+            date_format (str, optional): Format of the dates. Defaults to
+                                         None, inferred.
+            index_col (str, optional): Column to use as index, a date
+                                       column is parsed directly into it.
+                                       Defaults to None.
+            arrow_backed (bool, optional): Return Arrow backed columns.
+                                           Defaults to False.
+
+        Raises:
+            pd.errors.ParserError: if the response can't be parsed
 
+        Returns:
+            pd.DataFrame: parsed response
+        """
+        if CSV_ENGINE != "pyarrow":
+            df = pd.read_csv(raw,
+                             engine=CSV_ENGINE,
+                             encoding=CSV_ENCODING,
+                             usecols=columns,
+                             dtype=dtype,
+                             parse_dates=parse_dates,
+                             date_format=date_format,
+                             index_col=index_col,
+                             **({"dtype_backend": "pyarrow"} if arrow_backed else {}))
+            if columns is not None:
+                # usecols keeps the order of the file, the Arrow reader
+                # (and thereby the result) the requested one
+                ordered_columns = [col for col in columns if col in df.columns]
+                if list(df.columns) != ordered_columns:
+                    df = df[ordered_columns]
+            return df
+        column_types = {
+            col: pa.dictionary(pa.int32(), pa.string()) if dtype_ == "category" else pa.type_for_alias(dtype_)
+            for col, dtype_ in (dtype or {}).items()}
+        # Dates are read as strings and converted by pandas, which also
+        # knows the monthly, quarterly and annual periods of the SDW
+        column_types.update({col: pa.string() for col in parse_dates or []})
+        try:
+            table = pa_csv.read_csv(
+                raw,
+                read_options=pa_csv.ReadOptions(use_threads=True,
+                                                block_size=CSV_BLOCK_SIZE,
+                                                encoding=CSV_ENCODING),
+                convert_options=pa_csv.ConvertOptions(include_columns=columns,
+                                                      column_types=column_types,
+                                                      strings_can_be_null=True))
+        except pa.ArrowInvalid as e:
+            raise pd.errors.ParserError(e) from e
+        if not arrow_backed:
+            # Columns without any value become float64 NaN, as with pandas
+            table = table.cast(pa.schema([
+                field.with_type(pa.float64()) if pa.types.is_null(field.type) else field
+                for field in table.schema]))
+        df = table.to_pandas(self_destruct=True,
+                             split_blocks=True,
+                             types_mapper=pd.ArrowDtype if arrow_backed else None)
+        del table
+        for col in parse_dates or []:
+            if col not in df.columns:
+                continue
+            try:
+                dates = pd.to_datetime(df[col], format=date_format)
+            except ValueError:
+                dates = pd.to_datetime(df[col])
+            if col == index_col:
+                df.drop(columns=col, inplace=True)
+                df.index = pd.DatetimeIndex(dates, name=col)
+            else:
+                df[col] = dates
+        if index_col is not None and index_col in df.columns:
+            df.set_index(index_col, inplace=True)
+        return df
+
+
+    def _read_series_keys(
+        self,
+        content: bytes,
+        columns: List[str]=None
+        ) -> pd.DataFrame:
+        """Read a detail="serieskeysonly" response, which only lists the
+           series keys with their dimension values. The rows are split
+           by the csv module instead of running the type inferring CSV
+           parser.
+
+        Args:
+            content (bytes): response body, one line per series key
+            columns (List[str], optional): Subset of dimensions (columns)
+                                           to return. Defaults to None,
+                                           all columns.
+
+        Returns:
+            pd.DataFrame: series keys and their dimension values as strings
+        """
+        reader = csv.reader(content.decode(f"{CSV_ENCODING}-sig").splitlines())
+        header = next(reader, [])
+        df = pd.DataFrame(list(reader), columns=header)
+        return df[columns] if columns is not None else df
+
+
+    def _sort_by_date(
+        self,
+        df: pd.DataFrame,
+        ascending: bool
+        ) -> pd.DataFrame:
+        """Order a DataFrame by its index. The ECB mostly returns the
+           observations already ordered, then the frame is returned as is
+           or reversed instead of being sorted again.
+
+        Args:
+            df (pd.DataFrame): DataFrame to order
+            ascending (bool): Order of the index
+
+        Returns:
+            pd.DataFrame: DataFrame ordered by its index
+        """
+        if df.index.is_monotonic_increasing:
+            return df if ascending else df.iloc[::-1]
+        if df.index.is_monotonic_decreasing:
+            return df.iloc[::-1] if ascending else df
+        return df.sort_index(ascending=ascending)
+
+
+    def get_ecb_data_many(
+        self,
+        series_keys: List[str],
+        max_workers: int=8,
+        **kwargs
+        ) -> Dict[str, pd.DataFrame]:
+        """Fetches several time series keys concurrently with the same
+           parameters, see get_ecb_data. The requests share the pooled
+           keep-alive connections of the instance session, the
+           parallelism is capped at config.POOL_MAXSIZE.
+
+        Args:
+            series_keys (List[str]): time series keys to fetch
+            max_workers (int, optional): Number of parallel requests.
+                                         Defaults to 8.
+            **kwargs: further parameters of get_ecb_data, i.e. start_date
+
+        Returns:
+            Dict[str, pd.DataFrame]: Fetched data per time series key, in
+                                     the order of the series_keys
 
-# Test the class methods
-ecb_data_info = ECB_DATA_INFO()
+        Example:
+            >>> ecb_data_info_instance = ECB_DATA_INFO()
+            >>> ecb_data_info_instance.get_ecb_data_many(
+                            series_keys=["FM.M.U2.EUR.RT.MM.EURIBOR1MD_.HSTA",
+                                         "FM.M.U2.EUR.RT.MM.EURIBOR3MD_.HSTA"],
+                            start_date="2020-01-01")
+                {'FM.M.U2.EUR.RT.MM.EURIBOR1MD_.HSTA':                                          KEY  ...
+                ...
+        """
+        # Request every series only once
+        unique_series_keys = list(dict.fromkeys(series_keys))
+        # More workers than pooled connections would open connections that
+        # are discarded again after their request
+        max_workers = max(1, min(max_workers, cfg.POOL_MAXSIZE, len(unique_series_keys)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(unique_series_keys,
+                            executor.map(partial(self.get_ecb_data, **kwargs), unique_series_keys)))
+
+
+# Prespecified instance, only created on the first access of
+# ecb_data_info, so importing the module (i.e. only for the class) doesn't
+# set up a session and sdmx client. Concurrent first accesses create it
+# only once.
+_ecb_data_info = None
+_ecb_data_info_lock = threading.Lock()
+
+
+def __getattr__(name: str):
+    """Create the prespecified ECB_DATA_INFO instance on first access
+
+    Args:
+        name (str): requested module attribute
+
+    Raises:
+        AttributeError: for any other attribute than ecb_data_info
+
+    Returns:
+        ECB_DATA_INFO: the shared instance
+    """
+    global _ecb_data_info
+    if name == "ecb_data_info":
+        if _ecb_data_info is None:
+            with _ecb_data_info_lock:
+                if _ecb_data_info is None:
+                    _ecb_data_info = ECB_DATA_INFO()
+        return _ecb_data_info
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,27 @@
+# Main purpose of the module:
+# Exceptions shared by the client modules, so callers can catch a single
+# error type for every request made by the package.
+
+
+class ECBRequestError(Exception):
+    """Raised for error status codes of the ECB API, callers can catch
+       it and inspect the status_code instead of matching the message
+
+    Args:
+        status_code (int): HTTP status code of the response
+        msg (str): Error Message defined for the status code
+        url (str, optional): requested url. Defaults to None.
+    """
+    def __init__(
+        self,
+        status_code: int,
+        msg: str,
+        url: str=None
+        ):
+        self.status_code = status_code
+        self.msg = msg
+        self.url = url
+        message = f"Request Error Code: {status_code} - {msg}"
+        if url is not None:
+            message = f"{message} for URL: {url}"
+        super().__init__(message)
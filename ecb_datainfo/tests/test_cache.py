@@ -0,0 +1,315 @@
+import io
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from collections import OrderedDict
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+# Correctly set the parent directory to the project root
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+import cache  # noqa: E402
+
+
+class DataFrameCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.df = pd.DataFrame({
+            "KEY": pd.Categorical(["EXR.A.X", "EXR.A.X", "EXR.M.Y"]),
+            "OBS_VALUE": [1.0, 2.5, None],
+            }, index=pd.DatetimeIndex(["2020-01-01", "2020-02-01", "2020-03-01"], name="Date"))
+
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+    def test_round_trip_keeps_categoricals(self):
+        cache.DataFrameCache(cache_dir=self.cache_dir).set(
+            key="url", df=self.df, etag='"abc"', last_modified=None)
+        # A new instance has an empty memory layer and reads from disk
+        entry = cache.DataFrameCache(cache_dir=self.cache_dir).get(key="url")
+        self.assertIsNotNone(entry)
+        pd.testing.assert_frame_equal(entry["df"], self.df)
+        self.assertIsInstance(entry["df"]["KEY"].dtype, pd.CategoricalDtype)
+        self.assertEqual(entry["etag"], '"abc"')
+        if cache.HAS_PYARROW:
+            self.assertTrue(any(name.endswith(".parquet") for name in os.listdir(self.cache_dir)))
+
+
+    def test_missing_key(self):
+        self.assertIsNone(cache.DataFrameCache(cache_dir=self.cache_dir).get(key="url"))
+
+
+    def test_is_fresh_and_touch(self):
+        data_cache = cache.DataFrameCache(cache_dir=self.cache_dir, expire=60)
+        data_cache.set(key="url", df=self.df, etag=None, last_modified="Wed, 01 Jan 2025 00:00:00 GMT")
+        entry = data_cache.get(key="url")
+        self.assertTrue(data_cache.is_fresh(entry=entry))
+        entry["stored"] = time.time() - 120
+        self.assertFalse(data_cache.is_fresh(entry=entry))
+        data_cache.touch(key="url")
+        self.assertTrue(data_cache.is_fresh(entry=data_cache.get(key="url")))
+        # The refreshed time is persisted as well
+        reloaded = cache.DataFrameCache(cache_dir=self.cache_dir, expire=60).get(key="url")
+        self.assertTrue(data_cache.is_fresh(entry=reloaded))
+        self.assertFalse(cache.DataFrameCache(cache_dir=self.cache_dir, expire=0).is_fresh(entry=reloaded))
+
+
+    def test_clear(self):
+        data_cache = cache.DataFrameCache(cache_dir=self.cache_dir)
+        data_cache.set(key="url", df=self.df, etag='"abc"', last_modified=None)
+        data_cache.clear()
+        self.assertIsNone(data_cache.get(key="url"))
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+
+    def test_get_meta_does_not_load_the_dataframe(self):
+        cache.DataFrameCache(cache_dir=self.cache_dir).set(
+            key="url", df=self.df, etag='"abc"', last_modified=None)
+        data_cache = cache.DataFrameCache(cache_dir=self.cache_dir)
+        with mock.patch.object(cache.pd, "read_parquet", side_effect=AssertionError("parquet read")):
+            meta = data_cache.get_meta(key="url")
+        self.assertEqual(meta["etag"], '"abc"')
+        if cache.HAS_PYARROW:
+            self.assertNotIn("df", meta)
+        pd.testing.assert_frame_equal(data_cache.get(key="url")["df"], self.df)
+
+
+    def test_set_keeps_written_dataframes_on_disk_only(self):
+        data_cache = cache.DataFrameCache(cache_dir=self.cache_dir)
+        data_cache.set(key="url", df=self.df, etag='"abc"', last_modified=None)
+        self.assertNotIn("df", data_cache.memory["url"])
+        entry = data_cache.get(key="url")
+        self.assertIsNot(entry["df"], self.df)
+        pd.testing.assert_frame_equal(entry["df"], self.df)
+
+
+    def test_disk_store_is_size_bounded(self):
+        data_cache = cache.DataFrameCache(cache_dir=self.cache_dir)
+        data_cache.set(key="old", df=self.df, etag='"abc"', last_modified=None)
+        first_files = sorted(os.listdir(self.cache_dir))
+        self.assertTrue(first_files)
+        entry_bytes = sum(os.path.getsize(os.path.join(self.cache_dir, name)) for name in first_files)
+        # Room for exactly one entry, the least recently written one goes
+        data_cache.max_bytes = entry_bytes
+        old_mtime = time.time() - 60
+        for name in first_files:
+            os.utime(os.path.join(self.cache_dir, name), (old_mtime, old_mtime))
+        data_cache.set(key="new", df=self.df, etag='"def"', last_modified=None)
+        remaining = os.listdir(self.cache_dir)
+        self.assertTrue(remaining)
+        self.assertFalse(set(first_files) & set(remaining))
+        self.assertTrue(all(name.startswith(cache.hash_key("new")) for name in remaining))
+        self.assertIsNone(cache.DataFrameCache(cache_dir=self.cache_dir).get(key="old"))
+
+
+    def test_store_is_only_scanned_beyond_the_limit(self):
+        data_cache = cache.DataFrameCache(cache_dir=self.cache_dir)
+        with mock.patch.object(cache, "evict_oldest", wraps=cache.evict_oldest) as evict_oldest:
+            for key in ("a", "b", "c"):
+                data_cache.set(key=key, df=self.df, etag='"abc"', last_modified=None)
+            # The first write learns the size of the store
+            self.assertEqual(evict_oldest.call_count, 1)
+            data_cache.max_bytes = 1
+            data_cache.set(key="d", df=self.df, etag='"abc"', last_modified=None)
+            self.assertEqual(evict_oldest.call_count, 2)
+
+
+    def test_memory_only_cache(self):
+        data_cache = cache.DataFrameCache(cache_dir=None)
+        data_cache.set(key="url", df=self.df, etag='"abc"', last_modified=None)
+        data_cache.touch(key="url")
+        entry = data_cache.get(key="url")
+        # A copy is kept apart from the DataFrame of the caller
+        self.assertIsNot(entry["df"], self.df)
+        pd.testing.assert_frame_equal(entry["df"], self.df)
+        data_cache.clear()
+        self.assertIsNone(data_cache.get(key="url"))
+        self.assertTrue(data_cache.enabled)
+        self.assertFalse(cache.DataFrameCache(cache_dir=None, max_entries=0).enabled)
+
+
+    def test_eviction_from_another_thread_during_get(self):
+        data_cache = cache.DataFrameCache(cache_dir=self.cache_dir, max_entries=1)
+        test_df = self.df
+
+        class EvictingDict(OrderedDict):
+            evicted = False
+
+            def get(self, key, default=None):
+                entry = super().get(key, default)
+                # Right after the lookup another thread inserts a new entry,
+                # which evicts the looked up one from the LRU
+                if not EvictingDict.evicted:
+                    EvictingDict.evicted = True
+                    evictor = threading.Thread(
+                        target=data_cache._remember,
+                        kwargs={"key": "other", "entry": {"df": test_df}})
+                    evictor.start()
+                    evictor.join(timeout=0.2)
+                return entry
+
+        data_cache.memory = EvictingDict()
+        data_cache._remember(key="url", entry={"df": test_df})
+        entry = data_cache.get(key="url")
+        self.assertIs(entry["df"], test_df)
+        # The evicting thread completes once the lookup released the lock
+        time.sleep(0.3)
+        self.assertEqual(list(data_cache.memory), ["other"])
+
+
+class StubTransport(HTTPAdapter):
+    """Transport answering every request with a canned response and
+       recording the requests instead of going over the network
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.requests = []
+        self.status_code = 200
+        self.content = b"<structure/>"
+        self.headers = {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        response = requests.models.Response()
+        response.status_code = self.status_code
+        response.headers = requests.structures.CaseInsensitiveDict(self.headers)
+        response.raw = io.BytesIO(self.content if self.status_code == 200 else b"")
+        response.url = request.url
+        response.request = request
+        return response
+
+
+class StubCachingAdapter(cache.CachingAdapter, StubTransport):
+    pass
+
+
+class CachingAdapterTest(unittest.TestCase):
+    url = "https://stub.test/service/codelist/ECB/CL_FREQ/latest"
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.adapter = StubCachingAdapter(cache=cache.MetadataCache(cache_dir=self.cache_dir))
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+
+
+    def tearDown(self):
+        self.session.close()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+    def test_miss_then_hit(self):
+        first = self.session.get(self.url)
+        second = self.session.get(self.url)
+        self.assertEqual(len(self.adapter.requests), 1)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.headers["ETag"], '"v1"')
+
+
+    def test_hit_from_disk(self):
+        self.session.get(self.url)
+        # A new cache instance has an empty memory layer and reads from disk
+        self.adapter.cache = cache.MetadataCache(cache_dir=self.cache_dir)
+        self.assertEqual(self.session.get(self.url).content, b"<structure/>")
+        self.assertEqual(len(self.adapter.requests), 1)
+
+
+    def test_uncacheable_requests_are_passed_on(self):
+        self.session.get("https://stub.test/service/data/EXR/D.USD.EUR.SP00.A")
+        self.session.get("https://stub.test/service/data/EXR/D.USD.EUR.SP00.A")
+        self.session.post(self.url)
+        self.assertEqual(len(self.adapter.requests), 3)
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+
+    def test_no_cache_requests_are_passed_on(self):
+        self.session.get(self.url)
+        self.session.get(self.url, headers={"Cache-Control": "no-cache"})
+        self.assertEqual(len(self.adapter.requests), 2)
+        self.assertNotIn("Cache-Control", self.adapter.requests[0].headers)
+
+
+    def test_interrupted_write_keeps_the_entry(self):
+        self.session.get(self.url)
+
+        def interrupted_dump(obj, f, protocol=None):
+            f.write(b"partial")
+            raise OSError("No space left on device")
+
+        with mock.patch.object(cache.pickle, "dump", interrupted_dump):
+            self.adapter.cache.touch(url=self.url)
+        self.assertEqual(os.listdir(self.cache_dir), [f"{cache.hash_key(self.url)}.pickle"])
+        reloaded = cache.MetadataCache(cache_dir=self.cache_dir).get(url=self.url)
+        self.assertEqual(reloaded["content"], b"<structure/>")
+
+
+    def test_failed_responses_are_not_cached(self):
+        self.adapter.status_code = 404
+        self.session.get(self.url)
+        self.adapter.status_code = 200
+        self.assertEqual(self.session.get(self.url).content, b"<structure/>")
+        self.assertEqual(len(self.adapter.requests), 2)
+
+
+    def test_expired_entry_is_revalidated(self):
+        self.session.get(self.url)
+        self.adapter.cache.memory[self.url]["stored"] = time.time() - 2 * self.adapter.cache.expire
+        self.adapter.status_code = 304
+        response = self.session.get(self.url)
+        revalidation = self.adapter.requests[-1]
+        self.assertEqual(revalidation.headers["If-None-Match"], '"v1"')
+        self.assertEqual(revalidation.headers["If-Modified-Since"], "Wed, 01 Jan 2025 00:00:00 GMT")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"<structure/>")
+        # The refreshed entry is served without going over the network again
+        self.session.get(self.url)
+        self.assertEqual(len(self.adapter.requests), 2)
+        reloaded = cache.MetadataCache(cache_dir=self.cache_dir).get(url=self.url)
+        self.assertTrue(self.adapter.cache.is_fresh(entry=reloaded))
+
+
+    def test_changed_entry_is_replaced(self):
+        self.session.get(self.url)
+        self.adapter.cache.memory[self.url]["stored"] = time.time() - 2 * self.adapter.cache.expire
+        self.adapter.content = b"<structure version='2'/>"
+        self.adapter.headers = {"ETag": '"v2"'}
+        self.assertEqual(self.session.get(self.url).content, b"<structure version='2'/>")
+        self.assertEqual(self.session.get(self.url).headers["ETag"], '"v2"')
+        self.assertEqual(len(self.adapter.requests), 2)
+
+
+    def test_eviction(self):
+        self.adapter.cache.max_entries = 1
+        other_url = self.url.replace("CL_FREQ", "CL_CURRENCY")
+        self.session.get(self.url)
+        self.session.get(other_url)
+        self.assertEqual(list(self.adapter.cache.memory), [other_url])
+        # The evicted entry is still served from disk
+        self.session.get(self.url)
+        self.assertEqual(len(self.adapter.requests), 2)
+        # Beyond max_bytes the least recently written entry leaves the disk
+        file_bytes = os.path.getsize(self.adapter.cache._path(url=self.url))
+        self.adapter.cache.max_bytes = file_bytes
+        old_mtime = time.time() - 60
+        os.utime(self.adapter.cache._path(url=self.url), (old_mtime, old_mtime))
+        self.adapter.cache.memory.clear()
+        self.session.get(self.url.replace("CL_FREQ", "CL_UNIT"))
+        self.assertFalse(os.path.exists(self.adapter.cache._path(url=self.url)))
+        self.session.get(self.url)
+        self.assertEqual(len(self.adapter.requests), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
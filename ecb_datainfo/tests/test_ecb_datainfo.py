@@ -0,0 +1,489 @@
+import gc
+import io
+import asyncio
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import weakref
+from unittest import mock
+from urllib.parse import urlsplit
+import pandas as pd
+import requests
+
+# The package (project root) has to come first, the flat module imports of
+# the package (config, cache, ...) are resolved from its directory
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.dirname(parent_dir))
+
+import ecb_datainfo  # noqa: E402
+import async_client  # noqa: E402
+import cache  # noqa: E402
+from ecb_datainfo import ecb_datainfo as client_module  # noqa: E402
+from test_cache import StubTransport  # noqa: E402
+
+# Single dataflow requested by the connection check of the constructor
+PROBE_PATH = "/service/dataflow/ECB/EXR/latest"
+SERIES_KEY = "FM.M.U2.EUR.RT.MM.EURIBOR1YD_.HSTA"
+SERIES_PATH = "/service/data/FM/M.U2.EUR.RT.MM.EURIBOR1YD_.HSTA"
+
+
+def sdmx_csv(
+    series_key: str,
+    periods: list,
+    offset: float=0.0
+    ) -> bytes:
+    """Canned SDMX-CSV data response of a single series, with an all-null
+       attribute column (OBS_COM) like the responses of the ECB API
+    """
+    freq = series_key.split(".")[1]
+    header = "KEY,FREQ,REF_AREA,CURRENCY,TIME_PERIOD,OBS_VALUE,OBS_STATUS,OBS_CONF,OBS_COM,TITLE,TITLE_COMPL,UNIT,UNIT_MULT"
+    rows = [
+        f'{series_key},{freq},U2,EUR,{period},{offset + 1.5 + i / 4},A,F,,Euribor 1-year,'
+        f'"Euribor 1-year, historical close",PCPA,0'
+        for i, period in enumerate(periods)]
+    return "\n".join([header, *rows]).encode()
+
+
+def series_keys_csv(
+    dataflow: str
+    ) -> bytes:
+    """Canned SDMX-CSV series keys listing of a dataflow
+    """
+    return (
+        "KEY,FREQ,UNIT,UNIT_MULT,TITLE_COMPL\n"
+        f"{dataflow}.A.USD,A,USD,0,US dollar Trade rate\n"
+        f"{dataflow}.M.JPY,M,JPY,0,\"Japanese yen, monthly average\"\n"
+        f"{dataflow}.D.GBP,D,GBP,0,Pound sterling\n").encode()
+
+
+class RoutingTransport(StubTransport):
+    """Stub transport answering per url path, unknown paths with 404. A
+       route is a (status code, body, headers) tuple or a callable
+       returning one for the request.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.routes = {PROBE_PATH: (200, b"", {})}
+
+
+    def send(self, request, **kwargs):
+        route = self.routes.get(urlsplit(request.url).path, (404, b"", {}))
+        if callable(route):
+            route = route(request)
+        self.status_code, self.content, self.headers = route
+        return super().send(request, **kwargs)
+
+
+class StubClientAdapter(cache.CachingAdapter, RoutingTransport):
+    pass
+
+
+def make_client(**kwargs):
+    """ECB_DATA_INFO instance whose session is answered by a RoutingTransport
+       instead of the network, the data caches are off unless passed
+    """
+    kwargs.setdefault("use_data_cache", False)
+    with mock.patch.object(cache, "CachingAdapter", StubClientAdapter):
+        client = ecb_datainfo.ECB_DATA_INFO(**kwargs)
+    return client, client._session.get_adapter("https://")
+
+
+class ECBRequestErrorTest(unittest.TestCase):
+    def setUp(self):
+        self.client, self.transport = make_client()
+
+
+    def tearDown(self):
+        self.client.close()
+
+
+    def test_package_exports_the_raised_class(self):
+        self.assertIs(ecb_datainfo.ECBRequestError, client_module.ECBRequestError)
+        self.assertIs(ecb_datainfo.ECBRequestError, async_client.ECBRequestError)
+
+
+    def test_get_ecb_data_error_caught_via_package(self):
+        with self.assertRaises(ecb_datainfo.ECBRequestError) as raised:
+            self.client.get_ecb_data(series_key="EXR.D.USD.EUR.SP00.A")
+        self.assertEqual(raised.exception.status_code, 404)
+
+
+    def test_resilient_request_error_caught_via_package(self):
+        response = requests.models.Response()
+        response.status_code = 404
+        response.url = "https://stub.test/service/data/EXR"
+        with self.assertRaises(ecb_datainfo.ECBRequestError):
+            self.client._ECB_DATA_INFO__resilient_request(response=response)
+
+
+    def test_fetch_error_caught_via_package(self):
+        with self.assertRaises(ecb_datainfo.ECBRequestError) as raised:
+            asyncio.run(async_client.fetch(endpoint="/service/data/EXR", session=self.client._session))
+        self.assertEqual(raised.exception.status_code, 404)
+
+
+class InstanceTest(unittest.TestCase):
+    def test_instance_is_freed_without_the_cyclic_gc(self):
+        client, _ = make_client()
+        client_ref = weakref.ref(client)
+        gc.disable()
+        try:
+            del client
+            self.assertIsNone(client_ref())
+        finally:
+            gc.enable()
+
+
+    def test_dataflow_metadata_is_requested_once(self):
+        client, _ = make_client()
+        with mock.patch.object(client, "_fetch_dataflow_metadata", side_effect=lambda dataflow: object()) as fetch:
+            first = client._get_dataflow_metadata("EXR")
+            self.assertIs(client._get_dataflow_metadata("EXR"), first)
+            client._get_dataflow_metadata("FM")
+            self.assertEqual(fetch.call_count, 2)
+            client.clear_cache()
+            self.assertIsNot(client._get_dataflow_metadata("EXR"), first)
+            self.assertEqual(fetch.call_count, 3)
+        client.close()
+
+
+    def test_shared_instance_is_created_once(self):
+        def slow_instance():
+            # Widens the window between the check and the creation
+            time.sleep(0.05)
+            return object()
+
+        shared_instances = []
+        with mock.patch.object(client_module, "_ecb_data_info", None), \
+                mock.patch.object(client_module, "ECB_DATA_INFO", side_effect=slow_instance) as create:
+            threads = [
+                threading.Thread(target=lambda: shared_instances.append(client_module.ecb_data_info))
+                for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(create.call_count, 1)
+        self.assertEqual(len(set(map(id, shared_instances))), 1)
+
+
+class DataCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.client, self.transport = make_client()
+        self.cache_dir = tempfile.mkdtemp()
+        # Time series are revalidated on every request, as configured
+        self.client.data_cache = self.new_session_cache()
+        self.body = sdmx_csv(series_key=SERIES_KEY, periods=["2020-01", "2020-02", "2020-03"])
+        self.transport.routes[SERIES_PATH] = (200, self.body, {"ETag": '"v1"'})
+
+
+    def tearDown(self):
+        self.client.close()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+    def new_session_cache(self):
+        """Data cache of a new session, it knows the stored entries from disk
+        """
+        return cache.DataFrameCache(cache_dir=self.cache_dir, expire=client_module.cfg.DATA_CACHE_EXPIRE)
+
+
+    def test_unchanged_series_is_loaded_after_304(self):
+        first = self.client.get_ecb_data(series_key=SERIES_KEY)
+        self.client.data_cache = self.new_session_cache()
+        self.transport.routes[SERIES_PATH] = (304, b"", {})
+        second = self.client.get_ecb_data(series_key=SERIES_KEY)
+        self.assertEqual(self.transport.requests[-1].headers["If-None-Match"], '"v1"')
+        pd.testing.assert_frame_equal(second, first)
+        # The returned frames are kept apart from the cached one
+        second.iloc[0, second.columns.get_loc("OBS_VALUE")] = -1.0
+        self.assertEqual(self.client.get_ecb_data(series_key=SERIES_KEY)["OBS_VALUE"].iloc[0], 1.5)
+
+
+    def test_changed_series_does_not_load_the_stored_dataframe(self):
+        self.client.get_ecb_data(series_key=SERIES_KEY)
+        self.client.data_cache = self.new_session_cache()
+        changed_body = sdmx_csv(series_key=SERIES_KEY, periods=["2020-01", "2020-02", "2020-03", "2020-04"])
+        self.transport.routes[SERIES_PATH] = (200, changed_body, {"ETag": '"v2"'})
+        with mock.patch.object(cache.pd, "read_parquet", side_effect=AssertionError("parquet read")), \
+                mock.patch.object(cache.pickle, "load", wraps=cache.pickle.load) as pickle_load:
+            changed = self.client.get_ecb_data(series_key=SERIES_KEY)
+        self.assertEqual(self.transport.requests[-1].headers["If-None-Match"], '"v1"')
+        self.assertEqual(len(changed), 4)
+        # Only the meta file was read (with pyarrow without the DataFrame)
+        self.assertEqual(pickle_load.call_count, 1)
+        self.assertEqual(self.client.data_cache.get_meta(key=self.transport.requests[-1].url)["etag"], '"v2"')
+
+
+    def test_series_evicted_after_its_validators_were_read(self):
+        first = self.client.get_ecb_data(series_key=SERIES_KEY)
+        self.client.data_cache = self.new_session_cache()
+        self.client.data_cache.get_meta(key=self.transport.requests[-1].url)
+        # i.e. another process evicts the entry in the meantime
+        for file_name in os.listdir(self.cache_dir):
+            os.remove(os.path.join(self.cache_dir, file_name))
+        self.transport.routes[SERIES_PATH] = lambda request: (
+            (304, b"", {}) if "If-None-Match" in request.headers else (200, self.body, {"ETag": '"v1"'}))
+        pd.testing.assert_frame_equal(self.client.get_ecb_data(series_key=SERIES_KEY), first)
+        if cache.HAS_PYARROW:
+            # Without pyarrow the DataFrame was read together with the
+            # validators, the 304 is answered with it
+            self.assertNotIn("If-None-Match", self.transport.requests[-1].headers)
+
+
+class ReadEcbDataTest(unittest.TestCase):
+    # TIME_PERIOD per frequency as sent by the ECB API, daily series come
+    # newest first
+    periods = {
+        "D": ["2024-01-31", "2024-01-30", "2024-01-29"],
+        "M": ["2020-01", "2020-02", "2020-03"],
+        "Q": ["2020-Q1", "2020-Q2", "2020-Q3"],
+        "A": ["2019", "2020", "2021"],
+        }
+    engines = ["c", "pyarrow"] if client_module.HAS_PYARROW else ["c"]
+
+    def setUp(self):
+        self.client, self.transport = make_client()
+
+
+    def tearDown(self):
+        self.client.close()
+
+
+    def baseline(
+        self,
+        body: bytes
+        ) -> pd.DataFrame:
+        """Frame of the original parsing (pd.read_csv of the decoded body)
+           with the declared dtypes of the known columns. TIME_PERIOD is
+           read as string, the original parsing read annual periods as
+           integers, converted to nanoseconds since the epoch.
+        """
+        df = pd.read_csv(io.StringIO(body.decode()), dtype={"TIME_PERIOD": str})
+        df = df.rename({"TIME_PERIOD": "Date"}, axis=1).set_index("Date")
+        df.index = pd.to_datetime(df.index)
+        df = df.sort_index()
+        return df.astype({col: dtype for col, dtype in client_module._ECB_CSV_DTYPE.items() if col in df.columns})
+
+
+    def get_ecb_data(
+        self,
+        series_key: str,
+        body: bytes,
+        engine: str,
+        **kwargs
+        ) -> pd.DataFrame:
+        """get_ecb_data answered with body and parsed by the engine
+        """
+        self.transport.routes["/service/data/" + series_key.replace(".", "/", 1)] = (200, body, {})
+        with mock.patch.object(client_module, "CSV_ENGINE", engine):
+            return self.client.get_ecb_data(series_key=series_key, **kwargs)
+
+
+    def test_engines_match_the_baseline_per_frequency(self):
+        for frequency, periods in self.periods.items():
+            series_key = f"FM.{frequency}.U2.EUR.RT.MM.EURIBOR1YD_.HSTA"
+            body = sdmx_csv(series_key=series_key, periods=periods)
+            expected = self.baseline(body=body)
+            for engine in self.engines:
+                with self.subTest(frequency=frequency, engine=engine), \
+                        mock.patch.object(self.client, "_read_csv", wraps=self.client._read_csv) as read_csv:
+                    df = self.get_ecb_data(series_key=series_key, body=body, engine=engine)
+                    pd.testing.assert_frame_equal(df, expected)
+                    self.assertEqual(
+                        read_csv.call_args.kwargs["date_format"],
+                        client_module._ECB_DATE_FORMATS.get(frequency))
+                    self.assertIsInstance(df["KEY"].dtype, pd.CategoricalDtype)
+                    self.assertIsInstance(df["TITLE_COMPL"].dtype, pd.CategoricalDtype)
+                    # The all-null attribute column is float64 NaN
+                    self.assertEqual(df["OBS_COM"].dtype, "float64")
+                    self.assertEqual(df.index.name, "Date")
+
+
+    def test_engines_match_each_other_for_a_column_subset(self):
+        series_key = "FM.M.U2.EUR.RT.MM.EURIBOR1YD_.HSTA"
+        body = sdmx_csv(series_key=series_key, periods=self.periods["M"])
+        frames = [
+            self.get_ecb_data(series_key=series_key, body=body, engine=engine, columns=["OBS_VALUE", "KEY"])
+            for engine in self.engines]
+        for df in frames:
+            # In the requested order with either engine
+            self.assertEqual(list(df.columns), ["OBS_VALUE", "KEY"])
+            pd.testing.assert_frame_equal(df, self.baseline(body=body)[["OBS_VALUE", "KEY"]])
+
+
+    def test_malformed_response_raises_parser_error(self):
+        series_key = "FM.M.U2.EUR.RT.MM.EURIBOR1YD_.HSTA"
+        body = sdmx_csv(series_key=series_key, periods=self.periods["M"]) + b"\nFM.M.U2,M,too,many,,,,,,,,,,,,,columns"
+        for engine in self.engines:
+            with self.subTest(engine=engine), self.assertRaises(pd.errors.ParserError):
+                self.get_ecb_data(series_key=series_key, body=body, engine=engine)
+
+
+class BatchDataKeysTest(unittest.TestCase):
+    def setUp(self):
+        self.client, self.transport = make_client()
+        self.cache_dir = tempfile.mkdtemp()
+        self.client.data_keys_cache = cache.DataFrameCache(cache_dir=self.cache_dir)
+        # Known dataflows without the sdmx structure request
+        self.client.__dict__["all_dataflows"] = pd.Series(
+            {"EXR": "Exchange Rates", "SEE": "Securities exchange"})
+        for dataflow in ("EXR", "SEE"):
+            self.transport.routes[f"/service/data/{dataflow}"] = (200, series_keys_csv(dataflow), {})
+
+
+    def tearDown(self):
+        self.client.close()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+    def data_requests(self):
+        return [request for request in self.transport.requests if "/service/data/" in request.url]
+
+
+    def test_duplicates_are_requested_once_and_not_shared(self):
+        data_keys = self.client.batch_get_data_keys(dataflows=["EXR", "SEE", "EXR"])
+        self.assertEqual(list(data_keys), ["EXR", "SEE"])
+        self.assertEqual(len(self.data_requests()), 2)
+        self.assertEqual(list(data_keys["SEE"]["KEY"]), ["SEE.A.USD", "SEE.M.JPY", "SEE.D.GBP"])
+        # Changing a result leaves the cached listing untouched
+        data_keys["EXR"].drop(data_keys["EXR"].index, inplace=True)
+        cached_keys = self.client.batch_get_data_keys(dataflows=["EXR", "EXR"])
+        self.assertEqual(len(self.data_requests()), 2)
+        self.assertEqual(len(cached_keys["EXR"]), 3)
+        self.assertIsNot(cached_keys["EXR"], self.client.batch_get_data_keys(dataflows=["EXR"])["EXR"])
+
+
+class SearchTest(unittest.TestCase):
+    def setUp(self):
+        self.client, _ = make_client()
+        # Known dataflows without the sdmx structure request
+        self.client.__dict__["all_dataflows"] = pd.Series({
+            "EXR": "Exchange Rates",
+            "FXI": "Foreign Exchange Statistics",
+            "SEE": "Securities exchange - Trading Statistics",
+            "ICP": "HICP (Harmonised Index of Consumer Prices)",
+            })
+        self.data_keys = pd.DataFrame({
+            "KEY": ["SEE.A.USD", "SEE.M.JPY", "SEE.D.GBP", "SEE.A.CHF"],
+            "TITLE_COMPL": ["US dollar Trade rate", "Japanese yen (monthly)", None, "TRADE volume"],
+            })
+
+
+    def tearDown(self):
+        self.client.close()
+
+
+    def test_search_dataflows_ignores_case(self):
+        self.assertEqual(list(self.client.search_dataflows(key_word="EXCHANGE").index), ["EXR", "FXI", "SEE"])
+        # The lowercased dataflows are computed once and reused
+        lower = self.client._all_dataflows_lower
+        self.client.search_dataflows(key_word="rates")
+        self.assertIs(self.client._all_dataflows_lower, lower)
+
+
+    def test_search_dataflows_case_sensitive(self):
+        self.assertEqual(list(self.client.search_dataflows(key_word="Exchange", case=True).index), ["EXR", "FXI"])
+        self.assertTrue(self.client.search_dataflows(key_word="EXCHANGE", case=True).empty)
+
+
+    def test_search_dataflows_matches_key_words_literally(self):
+        # Regex metacharacters have no special meaning
+        self.assertTrue(self.client.search_dataflows(key_word="exch.nge").empty)
+        for case in (False, True):
+            with self.subTest(case=case):
+                self.assertEqual(
+                    list(self.client.search_dataflows(key_word="(Harmonised", case=case).index), ["ICP"])
+
+
+    def test_search_data_keys_ignores_case(self):
+        results = self.client.search_data_keys_for_dataflow(
+            key_word="Trade", all_data_keys_for_dataflow=self.data_keys)
+        self.assertEqual(list(results["KEY"]), ["SEE.A.USD", "SEE.A.CHF"])
+        self.assertEqual(list(results.index), [0, 1])
+        # Literal match of regex metacharacters, missing titles don't match
+        results = self.client.search_data_keys_for_dataflow(
+            key_word="YEN (", all_data_keys_for_dataflow=self.data_keys)
+        self.assertEqual(list(results["KEY"]), ["SEE.M.JPY"])
+
+
+    def test_search_data_keys_with_precomputed_lower(self):
+        precomputed_lower = self.data_keys["TITLE_COMPL"].str.lower()
+        with mock.patch.object(self.client, "_title_compl_lower") as title_compl_lower:
+            results = self.client.search_data_keys_for_dataflow(
+                key_word="TRADE", all_data_keys_for_dataflow=self.data_keys,
+                precomputed_lower=precomputed_lower)
+        title_compl_lower.assert_not_called()
+        self.assertEqual(list(results["KEY"]), ["SEE.A.USD", "SEE.A.CHF"])
+
+
+    def test_lowercased_title_is_reused_until_the_frame_changes(self):
+        lower = self.client._title_compl_lower(df=self.data_keys)
+        self.assertIs(self.client._title_compl_lower(df=self.data_keys), lower)
+        # Rows dropped in place invalidate the cached column
+        self.data_keys.drop(index=0, inplace=True)
+        self.assertEqual(len(self.client._title_compl_lower(df=self.data_keys)), 3)
+
+
+    def test_lowercased_title_is_dropped_with_the_frame(self):
+        self.client.search_data_keys_for_dataflow(key_word="trade", all_data_keys_for_dataflow=self.data_keys)
+        self.assertEqual(len(self.client._title_compl_lower_cache), 1)
+        del self.data_keys
+        gc.collect()
+        self.assertEqual(self.client._title_compl_lower_cache, {})
+
+
+class GetEcbDataOptionsTest(unittest.TestCase):
+    def setUp(self):
+        self.client, self.transport = make_client()
+        self.body = sdmx_csv(series_key=SERIES_KEY, periods=["2020-01", "2020-02", "2020-03"])
+        self.transport.routes[SERIES_PATH] = (200, self.body, {})
+
+
+    def tearDown(self):
+        self.client.close()
+
+
+    def test_squeeze_returns_the_observations(self):
+        observations = self.client.get_ecb_data(series_key=SERIES_KEY, squeeze=True, ascending=False)
+        self.assertIsInstance(observations, pd.Series)
+        self.assertEqual(observations.name, "OBS_VALUE")
+        self.assertEqual(list(observations), [2.0, 1.75, 1.5])
+        self.assertEqual(list(observations.index), list(pd.to_datetime(["2020-03-01", "2020-02-01", "2020-01-01"])))
+        self.assertEqual(observations.index.name, "Date")
+
+
+    def test_squeeze_requires_observations(self):
+        with self.assertRaises(ValueError):
+            self.client.get_ecb_data(series_key=SERIES_KEY, squeeze=True, detail="nodata")
+        self.assertNotIn(SERIES_PATH, [urlsplit(request.url).path for request in self.transport.requests])
+
+
+    def test_columns_keep_the_date_index(self):
+        df = self.client.get_ecb_data(series_key=SERIES_KEY, columns=["KEY"])
+        self.assertEqual(list(df.columns), ["KEY"])
+        self.assertEqual(df.index.name, "Date")
+        self.assertEqual(len(df), 3)
+
+
+    def test_serieskeysonly_is_split_into_strings(self):
+        body = (
+            b"KEY,FREQ,REF_AREA,CURRENCY,TITLE_COMPL\n"
+            b'FM.M.U2.EUR.RT.MM.EURIBOR1YD_.HSTA,M,U2,EUR,"Euribor 1-year, historical close"\n'
+            b"FM.M.U2.EUR.RT.MM.EURIBOR3MD_.HSTA,M,U2,EUR,Euribor 3-month\n")
+        self.transport.routes[SERIES_PATH] = (200, body, {})
+        df = self.client.get_ecb_data(series_key=SERIES_KEY, detail="serieskeysonly")
+        self.assertIn("detail=serieskeysonly", self.transport.requests[-1].url)
+        pd.testing.assert_frame_equal(df, pd.read_csv(io.BytesIO(body), dtype=str))
+        subset = self.client.get_ecb_data(series_key=SERIES_KEY, detail="serieskeysonly", columns=["KEY", "CURRENCY"])
+        self.assertEqual(list(subset.columns), ["KEY", "CURRENCY"])
+        self.assertEqual(list(subset["CURRENCY"]), ["EUR", "EUR"])
+
+
+if __name__ == "__main__":
+    unittest.main()